@@ -1,64 +1,222 @@
 from __future__ import annotations
 
 # Import base libraries
-import pygame
+import heapq
+import math
 from typing import Union, TYPE_CHECKING
 
 # Block off for type checking so cyclic import does not occur
 if TYPE_CHECKING:
-    # Import custom scripts
-    from graph import Graph, Node, Edge
+    # Import custom scripts, the algorithms only use the pygame free base
+    # classes so they can run without a display
+    from graphCore import BaseGraph as Graph, BaseNode as Node, BaseEdge as Edge
+
+# Algorithm class
+class Algorithm:
+    """Base class of the algorithms, each step is kept in a journal of the
+    changes it made so it can be undone and replayed. Subclasses provide
+    next_step, which runs a step and returns "Finished" once done, and prev_step"""
+    def __init__(self) -> None:
+        """Initialisation function of the algorithm class"""
+        # Steps run so far, and steps undone which can be replayed
+        self.steps: list[tuple] = []
+        self.redo_steps: list[tuple] = []
+
+        # Highlights held back while finishing, None when highlighting straight away
+        self.deferred: Union[list, None] = None
+
+        # Whether the algorithm was finished in one go on an array snapshot,
+        # which has no journal so is stepped back all at once
+        self.snapshot_finished = False
+
+    @property
+    def step_count(self) -> int:
+        return len(self.steps)
+
+    def highlight(self, item: Union[Node, Edge]) -> None:
+        """Highlights a node or edge, or holds it back while finishing"""
+        if self.deferred is None:
+            item.highlight()
+        else:
+            self.deferred.append(item)
+
+    def finish(self) -> str:
+        """Runs the algorithm to the end, highlighting everything once at the end
+        rather than drawing each step, on an array snapshot if nothing has been stepped"""
+        if self.steps == [] and self.redo_steps == [] and not self.snapshot_finished:
+            if self.finish_on_snapshot():
+                self.snapshot_finished = True
+                return "Finished"
 
-# Initialise pygame font library
-pygame.font.init()
+        self.deferred = []
+        try:
+            while self.next_step() != "Finished":
+                pass
+        finally:
+            deferred, self.deferred = self.deferred, None
+            for item in deferred:
+                item.highlight()
+
+        return "Finished"
+
+    def finish_on_snapshot(self) -> bool:
+        """Runs the whole algorithm on an array snapshot of the graph and highlights
+        the result, returns False if the algorithm cannot be run this way"""
+        return False
+
+    def snapshot(self):
+        """Returns an array snapshot of the graph, None if NumPy is not installed"""
+        # Imported when first used, as NumPy is slow to import and may not be installed
+        try:
+            from csrGraph import CSRGraph
+        except ImportError:
+            return None
+
+        return CSRGraph(self.graph)
+
+    def go_to_step(self, k: int) -> Union[str, None]:
+        """Steps backwards or forwards until k steps have been run"""
+        # A run finished on the snapshot goes back to the start first
+        if self.snapshot_finished:
+            self.prev_step()
+
+        while len(self.steps) > k:
+            self.prev_step()
+
+        while len(self.steps) < k:
+            if self.next_step() == "Finished":
+                return "Finished"
 
 # Prims class
-class Prims:
+class Prims(Algorithm):
     """Class to run prims minimum spanning tree algorithm"""
     def __init__(self, start_node: Node, graph: Graph) -> None:
         """Initialisation function of the prims class"""
+        # Run parent initialisation function
+        super().__init__()
 
         # Create instance variables
         self.graph = graph
         self.visited_nodes: list[Node] = [start_node]
+        self.visited: set[Node] = {start_node}
         self.chosen_edges: list[Edge] = []
-    
+
+        # Heap of edges leaving the visited nodes, entries are
+        # (weight, tie breaker, source node, destination node, edge)
+        self.frontier: list[tuple] = []
+        self.counter = 0
+
+        # Nodes in order, used to pick new roots if the graph is disconnected
+        self.all_nodes: list[Node] = [*self.graph.nodes]
+        self.root_position = 0
+
+        self.push_edges(start_node)
+
+    def push_edges(self, node: Node) -> None:
+        """Adds the edges leaving a node to the frontier"""
+        for (dest, edge) in self.graph.adjacency_lists[node].items():
+            if dest not in self.visited:
+                heapq.heappush(self.frontier, (edge.weight, self.counter, node, dest, edge))
+                self.counter += 1
+
     def next_step(self) -> Union[str, None]:
         """Runs the next step of the algorithm"""
+        # Replay a step that was undone, rather than working it out again
+        if self.redo_steps != []:
+            return self.apply(self.redo_steps.pop())
+
         # If all nodes visited, return finished so the algorithm stops
-        if len(self.visited_nodes) == len(self.graph.nodes):
+        if len(self.visited_nodes) == len(self.all_nodes):
             return "Finished"
 
-        # Choose the next node to visit
+        # Pop edges until one reaching an unvisited node is found,
+        # edges made stale by earlier steps are discarded here
+        popped = []
         choice = None
-
-        #  Iterate through each visited node
-        for node in self.visited_nodes:
-            # Iterate through each node and edge connection
-            for (dest, edge) in self.graph.adjacency_lists[node].items():
-                # If the connected node is not already visited and the weight is lower than
-                # the current choice, swap out the connected node to choose
-                if dest not in self.visited_nodes and (choice is None or edge.weight < choice[1].weight):
-                    choice = [dest, edge]
+        while self.frontier:
+            entry = heapq.heappop(self.frontier)
+            popped.append(entry)
+            _, _, source, dest, edge = entry
+            if source in self.visited and dest not in self.visited:
+                choice = (dest, edge)
+                break
+
+        root_position = self.root_position
+        if choice is None:
+            # The rest of the graph is unreachable, so start a new tree
+            # from the next unvisited node to build a spanning forest
+            while self.all_nodes[root_position] in self.visited:
+                root_position += 1
+            choice = (self.all_nodes[root_position], None)
+
+        # Journal entries are (popped entries, root position before and after, node, edge)
+        node, edge = choice
+        self.apply((popped, self.root_position, root_position, node, edge))
+        self.push_edges(node)
+
+    def apply(self, step: tuple) -> None:
+        """Makes the changes of a step and adds it to the journal"""
+        _, _, self.root_position, node, edge = step
 
         # Add node and connecting edge to corresponding visited lists
-        self.visited_nodes.append(choice[0])
-        self.chosen_edges.append(choice[1])
+        self.visited_nodes.append(node)
+        self.visited.add(node)
+        self.steps.append(step)
 
         # Highlight node and edge just used to show user what has happenned
-        choice[0].highlight()
-        choice[1].highlight()
+        self.highlight(node)
+        if edge is not None:
+            self.chosen_edges.append(edge)
+            self.highlight(edge)
+
+    def finish_on_snapshot(self) -> bool:
+        """Runs prims on an array snapshot of the graph and highlights the result"""
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return False
+
+        # Every node ends up visited, growing new trees if the graph is disconnected
+        start = self.visited_nodes[0]
+        self.chosen_edges = snapshot.edge_list(snapshot.prims(snapshot.node_index[start]))
+        self.visited_nodes = [start] + [node for node in self.all_nodes if node != start]
+        self.visited = set(self.visited_nodes)
+
+        for item in [*self.visited_nodes[1:], *self.chosen_edges]:
+            item.highlight()
+
+        return True
 
     def prev_step(self) -> None:
         """Function to step back through the algorithm"""
-        if self.visited_nodes != [] and self.chosen_edges != []:
-            # Unhighlight just visited node and edge
-            self.visited_nodes[-1].unhighlight()
-            self.chosen_edges[-1].unhighlight()
+        if self.snapshot_finished:
+            # Go back to the start, leaving the start node as it was
+            for item in [*self.visited_nodes[1:], *self.chosen_edges]:
+                item.unhighlight()
+            self.visited_nodes = self.visited_nodes[:1]
+            self.visited = set(self.visited_nodes)
+            self.chosen_edges = []
+            self.snapshot_finished = False
+        elif self.steps != []:
+            popped, self.root_position, root_position, node, edge = self.steps.pop()
+
+            # Unhighlight just visited node and remove from visited
+            self.visited_nodes.pop()
+            self.visited.remove(node)
+            node.unhighlight()
+
+            # Unhighlight the edge used to reach it, new roots have none
+            if edge is not None:
+                self.chosen_edges.pop()
+                edge.unhighlight()
 
-            # Remove node and edge from corresponding visited lists
-            self.visited_nodes = self.visited_nodes[:-1]
-            self.chosen_edges = self.chosen_edges[:-1]
+            # Put back the edges taken off the frontier, edges added from the
+            # node are left behind and ignored as their source is unvisited
+            for entry in popped:
+                heapq.heappush(self.frontier, entry)
+
+            # Replaying the step leaves the entries on the frontier, where they are
+            # stale again, so they do not need putting back a second time
+            self.redo_steps.append(([], self.root_position, root_position, node, edge))
 
     def clear_up(self) -> None:
         """Function to clear up highlights after finishing"""
@@ -70,107 +228,170 @@ class Prims:
         for edge in self.chosen_edges:
             edge.unhighlight()
 
+# Disjoint set class
+class DisjointSet:
+    """Disjoint set forest, used to detect cycles in Kruskal's algorithm,
+    unions are recorded so they can be undone"""
+    def __init__(self, items) -> None:
+        """Initialising function for the disjoint set class"""
+        # Each item starts off in its own set
+        self.parent = dict([(item, item) for item in items])
+        self.rank = dict([(item, 0) for item in items])
+
+        # Each union made, as (attached root, new root, whether the rank rose)
+        self.history: list[tuple] = []
+
+    def find(self, item):
+        """Returns the representative of the set holding the item"""
+        # Paths are not compressed so unions can be undone, union by
+        # rank keeps the trees shallow enough that finds stay fast
+        while self.parent[item] != item:
+            item = self.parent[item]
+
+        return item
+
+    def union(self, a, b) -> bool:
+        """Merges the sets holding a and b, returns False if already merged"""
+        root_a = self.find(a)
+        root_b = self.find(b)
+
+        # If both share a root, joining them would make a cycle
+        if root_a == root_b:
+            return False
+
+        # Attach the shallower tree beneath the deeper one
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        raised = self.rank[root_a] == self.rank[root_b]
+        if raised:
+            self.rank[root_a] += 1
+
+        self.history.append((root_b, root_a, raised))
+        return True
+
+    def undo(self) -> None:
+        """Undoes the last union made"""
+        root_b, root_a, raised = self.history.pop()
+        self.parent[root_b] = root_b
+        if raised:
+            self.rank[root_a] -= 1
+
 # Kruskals class
-class Kruskals:
+class Kruskals(Algorithm):
     """Handles running of Kruskal's algorithm for minimum spanning tree"""
     def __init__(self, graph: Graph) -> None:
         """Initialising function for Kruskals class"""
+        # Run parent initialisation function
+        super().__init__()
+
         # Create instance variables
         self.graph = graph
         self.visited_nodes: list[Node] = []
         self.chosen_edges: list[Edge] = []
 
+        # Sort the edges once, the algorithm then walks through them in order
+        self.sorted_edges: list[Edge] = sorted(self.graph.edges, key=lambda a: a.weight)
+        self.position = 0
+
+        # Count of chosen edges touching each node, used for highlighting
+        self.edge_counts: dict[Node, int] = {}
+
+        # Disjoint set of the nodes to detect cycles
+        self.components = DisjointSet(self.graph.nodes)
+
     def next_step(self) -> Union[str, None]:
         """Runs next step of the algorithm"""
-        # Get list of edges to pick from in weight order
-        # already chosen edges are removed
-        to_pick = [edge for edge in sorted(self.graph.edges, key=lambda a: a.weight) if edge not in self.chosen_edges]
-
-        if to_pick == []:
+        # Replay a step that was undone, rather than searching again
+        if self.redo_steps != []:
+            start, position = self.redo_steps.pop()
+            edge = self.sorted_edges[position]
+            self.components.union(edge.A, edge.B)
+            return self.apply((start, position))
+
+        # A spanning tree has one less edge than there are nodes, a run finished
+        # on the snapshot has already chosen every edge it can
+        if self.snapshot_finished or len(self.chosen_edges) >= len(self.graph.nodes) - 1:
             return "Finished"
-        
-        # variable to check for a cycle
-        cycle = True
 
-        # Copy the current graph
-        g = self.graph.copy()
+        # Skip past any edges that would create a cycle
+        start = self.position
+        while self.position < len(self.sorted_edges):
+            edge = self.sorted_edges[self.position]
+            self.position += 1
+            if self.components.union(edge.A, edge.B):
+                break
+        else:
+            # If no valid edges, return finished to stop the algorithm
+            return "Finished"
 
-        # Remove all edges not chosen
-        for edge in g.edges:
-            if edge not in self.chosen_edges:
-                g.delete_edge(edge)
+        # Journal entries are (position the search started at, position of the edge chosen)
+        self.apply((start, self.position - 1))
 
-        # Run depth first until complete on subgraph
-        d = DepthFirst(to_pick[0].A, g)
-        while d.next_step() != "Finished":
-            d.next_step()
+    def apply(self, step: tuple) -> None:
+        """Makes the changes of a step and adds it to the journal"""
+        _, position = step
+        edge = self.sorted_edges[position]
+        self.position = position + 1
+        self.steps.append(step)
 
-        # If node B not connected to node A then no cycle will be created
-        if to_pick[0].B not in d.visited_nodes:
-            cycle = False
+        # Check nodes not already visited
+        for node in [edge.A, edge.B]:
+            self.edge_counts[node] = self.edge_counts.get(node, 0) + 1
+            if self.edge_counts[node] == 1:
+                # If not visited, add to visited list and highlight
+                self.visited_nodes.append(node)
+                self.highlight(node)
 
-        # Repeat cycle check until edge found
-        # or until no valid edge is available
-        while cycle:
-            # Remove invalid edge
-            to_pick = to_pick[1:]
+        # Add edge to chosen edges and highlight
+        self.chosen_edges.append(edge)
+        self.highlight(edge)
 
-            # If no valid edges, return finished to stop the algorithm
-            if to_pick == []:
-                return "Finished"
+    def finish_on_snapshot(self) -> bool:
+        """Runs kruskals on an array snapshot of the graph and highlights the result"""
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return False
 
-            # Running depth first on sub graph
-            g = self.graph.copy()
-            for edge in g.edges:
-                if edge not in self.chosen_edges:
-                    g.delete_edge(edge)
+        # Nodes are visited in the order the chosen edges first touch them
+        self.chosen_edges = snapshot.edge_list(snapshot.kruskals())
+        self.visited_nodes = [*dict.fromkeys(node for edge in self.chosen_edges for node in [edge.A, edge.B])]
 
-            d = DepthFirst(to_pick[0].A, g)
-            while d.next_step() != "Finished":
-                d.next_step()
+        for item in [*self.visited_nodes, *self.chosen_edges]:
+            item.highlight()
 
-            if to_pick[0].B not in d.visited_nodes:
-                cycle = False
+        return True
 
-        # Check nodes not already visited
-        if to_pick[0].A not in self.visited_nodes:
-            # If not visited, add to visited list and highlight
-            self.visited_nodes.append(to_pick[0].A)
-            to_pick[0].A.highlight()
-        if to_pick[0].B not in self.visited_nodes:
-            # If not visited, add to visited list and highlight
-            self.visited_nodes.append(to_pick[0].B)
-            to_pick[0].B.highlight()
-
-        # Add node to chosen edges and highlight
-        self.chosen_edges.append(to_pick[0])
-        to_pick[0].highlight()
-    
     def prev_step(self) -> None:
         """Step back through the algorithm"""
+        if self.snapshot_finished:
+            # Go back to the start, nothing was stepped so the disjoint set is untouched
+            for item in [*self.visited_nodes, *self.chosen_edges]:
+                item.unhighlight()
+            self.visited_nodes = []
+            self.chosen_edges = []
+            self.snapshot_finished = False
         # Check that there are visited edges
-        if self.chosen_edges != []:
+        elif self.steps != []:
+            step = self.steps.pop()
+            self.redo_steps.append(step)
+
             # Unhighlight last picked edge and remove from list
-            self.chosen_edges[-1].unhighlight()
-            self.chosen_edges = self.chosen_edges[:-1]
-
-            # Get all nodes connected to current edges
-            nodes = []
-            for edge in self.chosen_edges:
-                nodes.append(edge.A)
-                nodes.append(edge.B)
-
-            # Turn nodes into set, such that no nodes are repeated
-            nodes = [*set(nodes)]
-
-            # Unhighlight all nodes connected to removed edge
-            # if not in above nodes
-            for node in nodes:
-                if node not in self.visited_nodes:
+            edge = self.chosen_edges.pop()
+            edge.unhighlight()
+            self.components.undo()
+
+            # Resume the search from where the step started it
+            self.position = step[0]
+
+            # Unhighlight nodes no longer connected to a chosen edge, which
+            # were visited by this step so are at the end of the visited list
+            for node in [edge.B, edge.A]:
+                self.edge_counts[node] -= 1
+                if self.edge_counts[node] == 0:
+                    del self.edge_counts[node]
+                    self.visited_nodes.pop()
                     node.unhighlight()
-                    
-            # Update visited nodes
-            self.visited_nodes = nodes
 
     def clear_up(self) -> None:
         """Clear up graph after algorithm is finished"""
@@ -182,50 +403,211 @@ class Kruskals:
         for edge in self.chosen_edges:
             edge.unhighlight()
 
-# Depth first class    
-class DepthFirst:
+# Depth first class
+class DepthFirst(Algorithm):
     """Class to handle the running of the depth first search algorithm"""
     def __init__(self, start_node: Node, graph: Graph) -> None:
         """Initialisation function of depth first class"""
+        # Run parent initialisation function
+        super().__init__()
+
         # Create instance variables
         self.graph = graph
         self.visited_nodes: list[Node] = [start_node]
+        self.visited: set[Node] = {start_node}
+        self.chosen_edges: list[Edge] = []
         self.cur_node = start_node
         self.visit_stack: list[Node] = [start_node]
 
+        # The start is visited from the beginning, so is highlighted straight away
+        self.highlight(start_node)
+
+        # Neighbours of each node, and how far through them the search has got,
+        # so each edge is looked at once over the whole search
+        self.neighbours: dict[Node, list[tuple[Node, Edge]]] = {}
+        self.cursors: dict[Node, int] = {}
+
+    def neighbour_list(self, node: Node) -> list[tuple[Node, Edge]]:
+        """Returns the neighbours of a node, with the edges joining them"""
+        if node not in self.neighbours:
+            self.neighbours[node] = [*self.graph.adjacency_lists[node].items()]
+
+        return self.neighbours[node]
+
     def next_step(self) -> Union[str, None]:
         """Steps through the algorithm"""
-        # Gets list of nodes adjacent to current node
-        to_choose = [node for node in self.graph.adjacency_lists[self.cur_node]]
+        # If visit stack is empty the algorithm is finished
+        if self.visit_stack == []:
+            return "Finished"
 
-        # Check if all nodes already visited
-        if all([node in self.visited_nodes for node in to_choose]):
-            # Step back to parent node
-            self.visit_stack = self.visit_stack[:-1]
+        # Replay a step that was undone, rather than searching again
+        if self.redo_steps != []:
+            return self.apply(self.redo_steps.pop())
+
+        # Move on to the first neighbour of the current node not yet visited
+        node = self.visit_stack[-1]
+        neighbours = self.neighbour_list(node)
+        start = cursor = self.cursors.get(node, 0)
+        while cursor < len(neighbours) and neighbours[cursor][0] in self.visited:
+            cursor += 1
 
-            # If visit stack is empty the algorithm is finished
+        # Journal entries are (node searched from, cursor before and after, node visited, edge used),
+        # if every neighbour is visited nothing is visited and the search steps back to the parent
+        if cursor < len(neighbours):
+            return self.apply((node, start, cursor + 1, *neighbours[cursor]))
+
+        return self.apply((node, start, cursor, None, None))
+
+    def apply(self, step: tuple) -> Union[str, None]:
+        """Makes the changes of a step and adds it to the journal"""
+        node, _, cursor, dest, edge = step
+        self.cursors[node] = cursor
+        self.steps.append(step)
+
+        if dest is None:
+            # Step back to parent node
+            self.visit_stack.pop()
             if self.visit_stack == []:
                 return "Finished"
-                
-            # Set the current node to the parent node
             self.cur_node = self.visit_stack[-1]
         else:
-            # Select the first unvisited node
-            while to_choose[0] in self.visited_nodes:
-                # Reduce the list if the first node is already visited
-                to_choose = to_choose[1:]
+            # Add the node to the visited nodes and stack
+            self.visited_nodes.append(dest)
+            self.visited.add(dest)
+            self.visit_stack.append(dest)
+            self.chosen_edges.append(edge)
+            self.cur_node = dest
+            self.highlight(dest)
+            self.highlight(edge)
 
-            # Change the current node to the choice
-            self.cur_node = to_choose[0]
+    def prev_step(self) -> None:
+        """Steps back through the algorithm"""
+        if self.steps != []:
+            step = self.steps.pop()
+            self.redo_steps.append(step)
+            node, cursor, _, dest, edge = step
+            self.cursors[node] = cursor
+
+            if dest is None:
+                # Go back down to the node that was stepped back from
+                self.visit_stack.append(node)
+            else:
+                # Forget the node that was visited
+                self.visited_nodes.pop()
+                self.visited.remove(dest)
+                self.visit_stack.pop()
+                self.chosen_edges.pop()
+                dest.unhighlight()
+                edge.unhighlight()
+            self.cur_node = node
 
-            # Add the node to the visited nodes and stack
-            self.visited_nodes.append(self.cur_node)
-            self.visit_stack.append(self.cur_node)
+    def clear_up(self) -> None:
+        """Clears up highlights after finishing"""
+        for node in self.visited_nodes:
+            node.unhighlight()
+
+        for edge in self.chosen_edges:
+            edge.unhighlight()
+
+# Breadth first class
+class BreadthFirst(Algorithm):
+    """Class to handle the running of the breadth first search algorithm"""
+    def __init__(self, start_node: Node, graph: Graph) -> None:
+        """Initialisation function of breadth first class"""
+        # Run parent initialisation function
+        super().__init__()
+
+        # Create instance variables
+        self.graph = graph
+        self.visited_nodes: list[Node] = [start_node]
+        self.visited: set[Node] = {start_node}
+        self.chosen_edges: list[Edge] = []
+        self.cur_node = start_node
+
+        # The start is visited from the beginning, so is highlighted straight away
+        self.highlight(start_node)
 
-    def prev_step(self):
+        # Nodes are searched from in the order they were visited, the head is
+        # the position in the visited nodes of the node being searched from
+        self.head = 0
+
+        # Neighbours of each node, and how far through them the search has got
+        self.neighbours: dict[Node, list[tuple[Node, Edge]]] = {}
+        self.cursors: dict[Node, int] = {}
+
+    def neighbour_list(self, node: Node) -> list[tuple[Node, Edge]]:
+        """Returns the neighbours of a node, with the edges joining them"""
+        if node not in self.neighbours:
+            self.neighbours[node] = [*self.graph.adjacency_lists[node].items()]
+
+        return self.neighbours[node]
+
+    def next_step(self) -> Union[str, None]:
+        """Steps through the algorithm"""
+        # Replay a step that was undone, rather than searching again
+        if self.redo_steps != []:
+            return self.apply(self.redo_steps.pop())
+
+        # Search from each node in turn until one has a neighbour not yet visited,
+        # nothing is changed unless one is found
+        head = self.head
+        while head < len(self.visited_nodes):
+            node = self.visited_nodes[head]
+            neighbours = self.neighbour_list(node)
+            start = cursor = self.cursors.get(node, 0)
+            while cursor < len(neighbours) and neighbours[cursor][0] in self.visited:
+                cursor += 1
+
+            # Journal entries are (head before and after, node searched from,
+            # cursor before and after, node visited, edge used)
+            if cursor < len(neighbours):
+                return self.apply((self.head, head, node, start, cursor + 1, *neighbours[cursor]))
+
+            head += 1
+
+        # If every visited node has been searched the algorithm is finished
+        return "Finished"
+
+    def apply(self, step: tuple) -> None:
+        """Makes the changes of a step and adds it to the journal"""
+        _, self.head, node, _, cursor, dest, edge = step
+        self.cursors[node] = cursor
+        self.steps.append(step)
+
+        # Add the node to the visited nodes
+        self.visited_nodes.append(dest)
+        self.visited.add(dest)
+        self.chosen_edges.append(edge)
+        self.cur_node = node
+        self.highlight(dest)
+        self.highlight(edge)
+
+    def prev_step(self) -> None:
         """Steps back through the algorithm"""
-        ...
-        
+        if self.steps != []:
+            step = self.steps.pop()
+            self.redo_steps.append(step)
+            self.head, _, node, cursor, _, dest, edge = step
+            self.cursors[node] = cursor
+
+            # Forget the node that was visited
+            self.visited_nodes.pop()
+            self.visited.remove(dest)
+            self.chosen_edges.pop()
+            dest.unhighlight()
+            edge.unhighlight()
+
+            # The current node is the one searched from in the step before
+            self.cur_node = self.steps[-1][2] if self.steps != [] else self.visited_nodes[0]
+
+    def clear_up(self) -> None:
+        """Clears up highlights after finishing"""
+        for node in self.visited_nodes:
+            node.unhighlight()
+
+        for edge in self.chosen_edges:
+            edge.unhighlight()
+
 # Box class
 class Box:
     """Handles boxes, which are used in dijkstra's algorithm"""
@@ -236,54 +618,21 @@ class Box:
         self.right: Union[str, int] = " "
         self.notes: list[int] = []
         self.node = node
-        
-        # Create instance constants
-        self.FONT = pygame.font.SysFont("Helvetica", 10)
-        self.PADDING = 4
-
-    def draw(self, screen: pygame.Surface) -> None:
-        """Function to draw the box to the screen"""
-        # Get x and y of paired node
-        x, y = self.node.x, self.node.y
-
-        # Render each piece of text
-        top_left = self.FONT.render(str(self.left), True, (0, 0, 0), (255, 255, 255))
-        top_right = self.FONT.render(str(self.right), True, (0, 0, 0), (255, 255, 255))
-        notes = self.FONT.render(", ".join([str(w) for w in self.notes]), True, (0, 0, 0), (255, 255, 255))
-
-        # Work out box width and height
-        box_width = max(notes.get_width(), top_left.get_width()+top_right.get_width()) + self.PADDING*3
-        box_height = top_left.get_height() + notes.get_height() + self.PADDING*3
-
-        # Work out the position of the top left of the box
-        top_x = x - box_width//2
-        top_y = y - self.node.RADIUS - 2 - box_height
-
-        # Draw the containing box for the text
-        pygame.draw.rect(screen, (255, 255, 255), (
-            top_x+self.PADDING//2, top_y+self.PADDING//2,
-            box_width-self.PADDING, box_height-self.PADDING))
-        pygame.draw.rect(screen, (0, 0, 0), (top_x, top_y, box_width, box_height), self.PADDING)
-
-        # Display the text
-        screen.blit(top_left, (top_x+self.PADDING, top_y + self.PADDING))
-        screen.blit(top_right, (top_x+top_left.get_width()+self.PADDING*2, top_y + self.PADDING))
-        screen.blit(notes, (top_x+self.PADDING, top_y+top_left.get_height()+self.PADDING*2))
-
-        # Draw the inner lines in the box
-        pygame.draw.line(screen, (0, 0, 0), (x-self.PADDING//2, top_y), (x-self.PADDING//2, top_y+box_height//2), self.PADDING)
-        pygame.draw.line(screen, (0, 0, 0), (top_x, top_y+box_height//2), (top_x+box_width, top_y+box_height//2), self.PADDING)
-        
+
 # Dijkstras class
-class Dijkstras:
+class Dijkstras(Algorithm):
     """Handles Dijkstras shortest path algorithm"""
     def __init__(self, graph: Graph, start_node: Node, end_node: Node) -> None:
         """Initialisation function for dijkstras"""
+        # Run parent initialisation function
+        super().__init__()
+
         # Create instance variables
         self.start = start_node
         self.end = end_node
         self.graph = graph
         self.cur_node = self.start
+        self.visited_nodes: list[Node] = [self.start]
 
         # Create a box for each node
         self.boxes: dict[Node, Box] = dict([[node, Box(node)] for node in self.graph.nodes])
@@ -292,94 +641,396 @@ class Dijkstras:
         self.boxes[self.start].left = 1
         self.boxes[self.start].right = 0
 
+        # Nodes whose boxes have changed since they were last drawn, cleared once redrawn
+        self.changed_boxes: dict[Node, None] = {}
+
+        # Heap of (priority, tie breaker, node, weight) waiting to be visited, a node
+        # is pushed again whenever its weight drops and old entries are skipped
+        self.queue: list[tuple] = []
+        self.counter = 0
+
     def next_step(self) -> Union[str, None]:
         """Steps through the algorithm"""
-        if self.cur_node == self.end:
+        # Finished once the end is reached, or a step found nothing left to visit
+        if self.cur_node == self.end or (self.steps != [] and self.steps[-1][4] is None):
             return "Finished"
+
+        # Replay a step that was undone, rather than working it out again
+        if self.redo_steps != []:
+            return self.apply(self.redo_steps.pop())
+
         # Get all adjacent nodes
-        new_nodes = [node for node in self.graph.adjacency_lists[self.cur_node]]
+        new_nodes = self.graph.adjacency_lists[self.cur_node]
 
         # Highlight each new edge being considered
-        for node in [n for n in new_nodes if self.boxes[n].left == " "]:
-            self.graph.adjacency_lists[self.cur_node][node].highlight()
+        highlighted = []
+        for (node, edge) in new_nodes.items():
+            if self.boxes[node].left == " ":
+                self.highlight(edge)
+                highlighted.append(edge)
 
         # Iterate through each new node
-        for node in new_nodes:
+        noted = []
+        for (node, edge) in new_nodes.items():
             # Calculate the weight to the node
-            new_weight = self.graph.adjacency_lists[self.cur_node][node].weight+self.boxes[self.cur_node].right
-            if self.boxes[node].notes != []:
-                # If there are already notes check
-                # that the new weight is less than the last note 
-                if new_weight < self.boxes[node].notes[-1]:
-                    # If it is lower add as a note
-                    self.boxes[node].notes.append(new_weight)
-            else:
-                # If the box has no notes add the weight regardless
-                self.boxes[node].notes.append(new_weight)
-
-        # Get a list of unvisited nodes
-        unvisited = [node for node in self.boxes if self.boxes[node].right == " " and self.boxes[node].notes != []]
+            new_weight = edge.weight+self.boxes[self.cur_node].right
+            notes = self.boxes[node].notes
+
+            # If there are no notes add the weight regardless, otherwise
+            # only add it if it is less than the last note
+            if notes == [] or new_weight < notes[-1]:
+                notes.append(new_weight)
+                noted.append((node, new_weight))
+                self.changed_boxes[node] = None
+
+                # Only unvisited nodes need to be queued
+                if self.boxes[node].right == " ":
+                    heapq.heappush(self.queue, (self.priority(node, new_weight), self.counter, node, new_weight))
+                    self.counter += 1
+
+        # Take the lowest weight unvisited node, skipping stale entries
+        popped = []
+        lowest = None
+        while self.queue:
+            entry = heapq.heappop(self.queue)
+            popped.append(entry)
+            _, _, node, weight = entry
+            if self.boxes[node].right == " " and weight == self.boxes[node].notes[-1]:
+                lowest = node
+                break
+
+        # Journal entries are (previous node, highlighted edges, notes added, popped entries, node visited)
+        self.steps.append((self.cur_node, highlighted, noted, popped, lowest))
 
         # If no nodes are unvisited return Finished to stop running
-        if unvisited == []:
+        if lowest is None:
+            return "Finished"
+
+        self.visit(lowest)
+
+    def priority(self, node: Node, weight: int) -> Union[int, float]:
+        """Returns the priority a node is queued with, the lowest is visited first"""
+        return weight
+
+    def apply(self, step: tuple) -> Union[str, None]:
+        """Makes the changes of a step that was undone and adds it back to the journal"""
+        _, highlighted, noted, _, lowest = step
+        self.steps.append(step)
+
+        for edge in highlighted:
+            self.highlight(edge)
+
+        for (node, weight) in noted:
+            self.boxes[node].notes.append(weight)
+            self.changed_boxes[node] = None
+
+        if lowest is None:
             return "Finished"
 
-        # Sort the nodes by weight from the beginning and pick the first
-        lowest = sorted(unvisited, key=lambda x: self.boxes[x].notes[-1])[0]
+        self.visit(lowest)
 
+    def visit(self, node: Node) -> None:
+        """Visits the node chosen by a step"""
         # Update the new node's box with the new weight
-        self.boxes[lowest].left = self.boxes[self.cur_node].left + 1
-        self.boxes[lowest].right = self.boxes[lowest].notes[-1]
+        self.boxes[node].left = self.boxes[self.cur_node].left + 1
+        self.boxes[node].right = self.boxes[node].notes[-1]
+        self.changed_boxes[node] = None
 
         # Update the current node
-        self.cur_node = lowest
+        self.cur_node = node
+        self.visited_nodes.append(node)
 
         # Highlight the node
-        lowest.highlight()
+        self.highlight(node)
 
     def prev_step(self) -> None:
         """Steps back through the algorithm"""
-        if self.cur_node != self.start:
-            self.cur_node.unhighlight()
-            prev = self.boxes[self.cur_node].left - 1
-            self.boxes[self.cur_node].left = " "
-            self.boxes[self.cur_node].right = " "
-
-            for (node, box) in self.boxes.items():
-                if box.left == prev:
-                    self.cur_node = node
+        if self.steps != []:
+            prev, highlighted, noted, popped, lowest = self.steps.pop()
+
+            # Undo the visit, a finishing step will not have moved the current node
+            if lowest is not None:
+                lowest.unhighlight()
+                self.boxes[lowest].left = " "
+                self.boxes[lowest].right = " "
+                self.changed_boxes[lowest] = None
+                self.visited_nodes.pop()
+                self.cur_node = prev
+
+            # Unhighlight each edge that was considered
+            for edge in highlighted:
+                edge.unhighlight()
+
+            # Remove the notes that were added
+            for (node, _) in noted:
+                self.boxes[node].notes.pop()
+                self.changed_boxes[node] = None
+
+            # Put back the entries taken off the queue, entries that were
+            # added are left behind and skipped as their weight is stale
+            for entry in popped:
+                heapq.heappush(self.queue, entry)
+
+            # Replaying the step leaves the entries on the queue, where they are
+            # stale again, so they do not need putting back a second time
+            self.redo_steps.append((prev, highlighted, noted, [], lowest))
+
+    def path(self) -> list[Node]:
+        """Returns the shortest path found to the end node, empty if not reached"""
+        if self.boxes[self.end].right == " ":
+            return []
+
+        # Walk back from the end, each step going to a node visited earlier
+        # whose weight plus the joining edge gives the current node's weight
+        path = [self.end]
+        while path[-1] != self.start:
+            box = self.boxes[path[-1]]
+            for (node, edge) in self.graph.adjacency_lists[path[-1]].items():
+                prev = self.boxes[node]
+                if prev.left != " " and prev.left < box.left and prev.right + edge.weight == box.right:
+                    path.append(node)
                     break
 
-            # Get all adjacent nodes
-            new_nodes = [node for node in self.graph.adjacency_lists[self.cur_node]]
-
-            # Highlight each new edge being considered
-            for node in [n for n in new_nodes if self.boxes[n].left == " "]:
-                self.graph.adjacency_lists[self.cur_node][node].unhighlight()
-
-            # Iterate through each new node
-            for node in new_nodes:
-                self.boxes[node].notes = self.boxes[node].notes[:-1]
+        return path[::-1]
 
     def clear_up(self):
         """Cleans up after the algorithm is finished"""
-        # Collect all visited nodes
-        nodes = []
-        for (node, box) in self.boxes.items():
-            if box.left != " ":
-                nodes.append(node)
-
-        # Unhighlight all nodes
-        for node in nodes:
+        # Unhighlight all visited nodes
+        for node in self.visited_nodes:
             node.unhighlight()
 
-        # Collect all visited edges
-        edges = []
-        for start_node in nodes:
-            edges += [*self.graph.adjacency_lists[start_node].values()]
+        # Unhighlight every edge that was considered
+        for (_, highlighted, _, _, _) in self.steps:
+            for edge in highlighted:
+                edge.unhighlight()
+
+# A star class
+class AStar(Dijkstras):
+    """Handles the A* shortest path algorithm, which is dijkstras algorithm
+    visiting nodes closer to the end node first"""
+    def __init__(self, graph: Graph, start_node: Node, end_node: Node) -> None:
+        """Initialisation function for A*"""
+        # Run parent initialisation function
+        super().__init__(graph, start_node, end_node)
+
+        # The heuristic is the straight line distance to the end, scaled by the lowest
+        # weight per unit length of any edge so it never overestimates the true weight
+        self.scale = min([
+            edge.weight / math.dist((edge.A.x, edge.A.y), (edge.B.x, edge.B.y))
+            for edge in self.graph.edges if (edge.A.x, edge.A.y) != (edge.B.x, edge.B.y)
+            ], default=0)
+
+        # Dijkstras for the same search, to compare the nodes visited against
+        self.comparison = DijkstrasCount(self.graph, self.start, self.end)
+
+    def heuristic(self, node: Node) -> float:
+        """Returns a lower bound of the weight from a node to the end node"""
+        return self.scale * math.dist((node.x, node.y), (self.end.x, self.end.y))
+
+    def priority(self, node: Node, weight: int) -> float:
+        """Returns the priority a node is queued with, the lowest is visited first"""
+        return weight + self.heuristic(node)
+
+    def summary(self) -> str:
+        """Returns how many nodes have been visited, compared with dijkstras"""
+        return f"A* visited {len(self.visited_nodes)} nodes, Dijkstras visits {self.comparison.text()}"
+
+# Dijkstras count class
+class DijkstrasCount:
+    """Runs dijkstras a step at a time alongside another shortest path algorithm,
+    counting the nodes it visits so the two can be compared"""
+    def __init__(self, graph: Graph, start_node: Node, end_node: Node) -> None:
+        """Initialisation function for the dijkstras count class"""
+        # Hold back the highlights of dijkstras so nothing is shown
+        self.dijkstras: Union[Dijkstras, None] = Dijkstras(graph, start_node, end_node)
+        self.dijkstras.deferred = []
+
+        # Number of nodes visited, None until dijkstras has finished
+        self.visited: Union[int, None] = None
+
+    def next_step(self) -> None:
+        """Runs the next step of dijkstras, keeping the count once it finishes"""
+        if self.dijkstras is not None and self.dijkstras.next_step() == "Finished":
+            self.visited = len(self.dijkstras.visited_nodes)
+            self.dijkstras = None
+
+    def text(self) -> str:
+        """Returns the count to show, which is still being worked out until dijkstras finishes"""
+        return str(self.visited) if self.visited is not None else "..."
+
+# Bidirectional dijkstras class
+class BidirectionalDijkstras(Algorithm):
+    """Handles dijkstras shortest path algorithm searching from both ends at once,
+    stopping once the searches have met on a shortest path"""
+    def __init__(self, graph: Graph, start_node: Node, end_node: Node) -> None:
+        """Initialisation function for bidirectional dijkstras"""
+        # Run parent initialisation function
+        super().__init__()
+
+        # Create instance variables
+        self.start = start_node
+        self.end = end_node
+        self.graph = graph
+
+        # Each list holds the search from the start, then the search from the end.
+        # Lowest weight found to each node and the edge it was reached by
+        self.best: list[dict[Node, int]] = [{self.start: 0}, {self.end: 0}]
+        self.via: list[dict[Node, Edge]] = [{}, {}]
+
+        # Nodes whose weight is final, in the order they were settled
+        self.settled: list[dict[Node, None]] = [{}, {}]
+
+        # Heaps of (weight, tie breaker, node) waiting to be settled, a node is
+        # pushed again whenever its weight drops and old entries are skipped
+        self.queues: list[list[tuple]] = [[(0, 0, self.start)], [(0, 1, self.end)]]
+        self.counter = 2
+
+        # Weight of the shortest path found so far, and the node the searches meet at on it
+        self.shortest: Union[int, None] = 0 if self.start == self.end else None
+        self.meeting: Union[Node, None] = self.start if self.start == self.end else None
+
+        # Dijkstras for the same search, to compare the nodes settled against
+        self.comparison = DijkstrasCount(self.graph, self.start, self.end)
 
-        edges = [*set(edges)]
+    def is_stale(self, side: int, entry: tuple) -> bool:
+        """Returns whether a queue entry has been settled or replaced by a lower weight"""
+        weight, _, node = entry
+        return node in self.settled[side] or self.best[side].get(node) != weight
 
-        # Unhighlight all edges
-        for edge in edges:
-            edge.unhighlight()
\ No newline at end of file
+    def highlights(self, side: int, node: Node) -> int:
+        """Returns how many times a settled node is highlighted"""
+        # The search from the start colours nodes with one highlight and the search
+        # from the end with two, the start is already highlighted when chosen
+        return 0 if (side, node) == (0, self.start) else side + 1
+
+    def next_step(self) -> Union[str, None]:
+        """Steps through the algorithm"""
+        # A step which settled nothing means the algorithm is finished
+        if self.steps != [] and self.steps[-1][1] is None:
+            return "Finished"
+
+        # Replay a step that was undone, rather than working it out again
+        if self.redo_steps != []:
+            return self.apply(self.redo_steps.pop())
+
+        # Clear stale entries off the top of both queues
+        popped = []
+        for side in [0, 1]:
+            while self.queues[side] != [] and self.is_stale(side, self.queues[side][0]):
+                popped.append((side, heapq.heappop(self.queues[side])))
+
+        # Once either search runs out every path has been found, otherwise the
+        # path found is shortest when no two unsettled nodes could make a shorter one
+        tops = [queue[0][0] if queue != [] else None for queue in self.queues]
+        if None in tops or (self.shortest is not None and tops[0] + tops[1] >= self.shortest):
+            # Journal entries are (side, node settled, popped entries, weights changed,
+            # shortest path before and after)
+            return self.apply((None, None, popped, [], (self.shortest, self.meeting), (self.shortest, self.meeting)))
+
+        # Settle the lowest node of the search with the lowest next weight
+        side = 0 if tops[0] <= tops[1] else 1
+        entry = heapq.heappop(self.queues[side])
+        popped.append((side, entry))
+        weight, _, node = entry
+
+        # Find the neighbours whose weight drops, queueing them again
+        changes = []
+        shortest, meeting = self.shortest, self.meeting
+        for (neighbour, edge) in self.graph.adjacency_lists[node].items():
+            new_weight = weight + edge.weight
+            if neighbour in self.settled[side] or new_weight >= self.best[side].get(neighbour, new_weight + 1):
+                continue
+
+            changes.append((neighbour, self.best[side].get(neighbour), self.via[side].get(neighbour), new_weight, edge))
+            heapq.heappush(self.queues[side], (new_weight, self.counter, neighbour))
+            self.counter += 1
+
+            # A node reached by both searches joins them into a path
+            other = self.best[1 - side].get(neighbour)
+            if other is not None and (shortest is None or new_weight + other < shortest):
+                shortest, meeting = new_weight + other, neighbour
+
+        return self.apply((side, node, popped, changes, (self.shortest, self.meeting), (shortest, meeting)))
+
+    def apply(self, step: tuple) -> Union[str, None]:
+        """Makes the changes of a step and adds it to the journal"""
+        side, node, _, changes, _, (self.shortest, self.meeting) = step
+        self.steps.append(step)
+
+        if node is None:
+            return "Finished"
+
+        # Settle the node
+        self.settled[side][node] = None
+        for _ in range(self.highlights(side, node)):
+            self.highlight(node)
+        if node in self.via[side]:
+            self.highlight(self.via[side][node])
+
+        # Lower the weights of the neighbours
+        for (neighbour, _, _, weight, edge) in changes:
+            self.best[side][neighbour] = weight
+            self.via[side][neighbour] = edge
+
+    def prev_step(self) -> None:
+        """Steps back through the algorithm"""
+        if self.steps != []:
+            side, node, popped, changes, (self.shortest, self.meeting), after = self.steps.pop()
+
+            if node is not None:
+                # Put back the weights of the neighbours
+                for (neighbour, weight, edge, _, _) in changes:
+                    if weight is None:
+                        del self.best[side][neighbour]
+                        del self.via[side][neighbour]
+                    else:
+                        self.best[side][neighbour] = weight
+                        self.via[side][neighbour] = edge
+
+                # Unsettle the node
+                del self.settled[side][node]
+                for _ in range(self.highlights(side, node)):
+                    node.unhighlight()
+                if node in self.via[side]:
+                    self.via[side][node].unhighlight()
+
+            # Put back the entries taken off the queues, entries that were
+            # added are left behind and skipped as their weight is stale
+            for (queue_side, entry) in popped:
+                heapq.heappush(self.queues[queue_side], entry)
+
+            # Replaying the step leaves the entries on the queues, where they are
+            # stale again, so they do not need putting back a second time
+            self.redo_steps.append((side, node, [], changes, (self.shortest, self.meeting), after))
+
+    def path(self) -> list[Node]:
+        """Returns the shortest path found from the start to the end, empty if none found"""
+        if self.meeting is None:
+            return []
+
+        # Walk from the meeting node back along the edges each search reached nodes by
+        halves = []
+        for side in [0, 1]:
+            half = [self.meeting]
+            while half[-1] in self.via[side]:
+                edge = self.via[side][half[-1]]
+                half.append(edge.A if edge.B == half[-1] else edge.B)
+            halves.append(half)
+
+        return halves[0][::-1] + halves[1][1:]
+
+    def summary(self) -> str:
+        """Returns how many nodes have been settled, compared with dijkstras"""
+        settled = len(self.settled[0]) + len(self.settled[1])
+        return f"Bidirectional settled {settled} nodes, Dijkstras visits {self.comparison.text()}"
+
+    def clear_up(self) -> None:
+        """Cleans up after the algorithm is finished"""
+        # Unhighlight the settled nodes and the edges they were reached by,
+        # including the highlight the start was given when chosen
+        for side in [0, 1]:
+            for node in self.settled[side]:
+                for _ in range(side + 1):
+                    node.unhighlight()
+                if node in self.via[side]:
+                    self.via[side][node].unhighlight()
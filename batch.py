@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+# Import base libraries
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Union
+
+# Import custom scripts, only the pygame free core is needed
+from graphCore import BaseGraph, BaseNode, BINARY_EXTENSION
+from algorithms import Prims, Kruskals, Dijkstras
+
+def find_graphs(pattern: str) -> list[str]:
+    """Returns the graph files in a directory or matching a glob"""
+    if os.path.isdir(pattern):
+        return sorted(
+            glob.glob(os.path.join(pattern, "*.json"))
+            + glob.glob(os.path.join(pattern, f"*{BINARY_EXTENSION}"))
+            )
+
+    return sorted(glob.glob(pattern))
+
+def find_node(graph: BaseGraph, name: Union[str, None], default: int) -> BaseNode:
+    """Returns the node with the given name, or the node at the default position"""
+    if name is None:
+        if len(graph.nodes) == 0:
+            raise KeyError("Graph has no nodes")
+        return [*graph.nodes][default]
+
+    for node in graph.nodes:
+        if node.name == name:
+            return node
+
+    raise KeyError(f"No node named {name}")
+
+def run_job(path: str, algorithm: str, start: Union[str, None], end: Union[str, None], csr: bool = False) -> dict:
+    """Runs an algorithm to completion on one graph file, returning the results"""
+    result = {"file": path, "algorithm": algorithm}
+
+    try:
+        # Load the graph
+        load_start = time.perf_counter()
+        graph = BaseGraph()
+        graph.load_file(path)
+        result["load_time"] = time.perf_counter() - load_start
+        result["nodes"] = len(graph.nodes)
+        result["edges"] = len(graph.edges)
+
+        run_start = time.perf_counter()
+        if csr:
+            # The array snapshot needs NumPy, so is only imported when used
+            from csrGraph import CSRGraph
+
+            # Run on the array snapshot, mapping the results back to nodes and edges
+            snapshot = CSRGraph(graph)
+            if algorithm == "dijkstras":
+                start_index = snapshot.node_index[find_node(graph, start, 0)]
+                end_index = snapshot.node_index[find_node(graph, end, -1)]
+                distances, via = snapshot.dijkstras(start_index, end_index)
+                path_nodes = snapshot.node_list(snapshot.path(via, start_index, end_index))
+                distance = distances[end_index]
+            elif algorithm == "prims":
+                chosen_edges = snapshot.edge_list(snapshot.prims(snapshot.node_index[find_node(graph, start, 0)]))
+            else:
+                chosen_edges = snapshot.edge_list(snapshot.kruskals())
+        else:
+            # Set up the algorithm
+            if algorithm == "dijkstras":
+                runner = Dijkstras(graph, find_node(graph, start, 0), find_node(graph, end, -1))
+            elif algorithm == "prims":
+                runner = Prims(find_node(graph, start, 0), graph)
+            else:
+                runner = Kruskals(graph)
+
+            # Step through until finished
+            while runner.next_step() != "Finished":
+                pass
+
+            if algorithm == "dijkstras":
+                path_nodes = runner.path()
+                distance = runner.boxes[runner.end].right if path_nodes != [] else None
+            else:
+                chosen_edges = runner.chosen_edges
+        result["run_time"] = time.perf_counter() - run_start
+
+        # Collect the results of the algorithm
+        if algorithm == "dijkstras":
+            result["path"] = [node.name for node in path_nodes]
+            result["distance"] = distance
+        else:
+            result["mst_weight"] = sum([edge.weight for edge in chosen_edges])
+            result["mst_edges"] = len(chosen_edges)
+    except Exception as e:
+        # Report the failure instead of stopping the whole batch
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+def main(args: Union[list[str], None] = None) -> None:
+    """Runs an algorithm over many saved graphs, writing a json line per graph"""
+    parser = argparse.ArgumentParser(description="Run a graph algorithm over saved graphs")
+    parser.add_argument("graphs", nargs="?", default="graphs", help="directory or glob of graph files")
+    parser.add_argument("-a", "--algorithm", choices=["dijkstras", "prims", "kruskals"], default="dijkstras")
+    parser.add_argument("-s", "--start", help="name of the start node, defaults to the first node")
+    parser.add_argument("-e", "--end", help="name of the end node for dijkstras, defaults to the last node")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("-o", "--output", help="file to write results to, defaults to standard output")
+    parser.add_argument("-c", "--csr", action="store_true", help="run on an array snapshot of each graph, needs NumPy")
+    options = parser.parse_args(args)
+
+    # Check NumPy can be imported before starting any workers
+    if options.csr:
+        try:
+            import csrGraph
+        except ImportError:
+            parser.error("--csr needs NumPy to be installed")
+
+    paths = find_graphs(options.graphs)
+    out = open(options.output, "w") if options.output else sys.stdout
+
+    try:
+        with ProcessPoolExecutor(max_workers=options.workers) as executor:
+            jobs = [
+                executor.submit(run_job, path, options.algorithm, options.start, options.end, options.csr)
+                for path in paths
+                ]
+
+            # Write each result as soon as it is ready
+            for job in as_completed(jobs):
+                print(json.dumps(job.result()), file=out, flush=True)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
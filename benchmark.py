@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+# Import base libraries
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Union
+
+# Draw to an off-screen window so the benchmark can run without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+# Import custom scripts
+from graph import Graph
+from graphCore import BaseGraph, BaseNode, BINARY_EXTENSION
+from settings import Settings
+from algorithms import Prims, Kruskals, Dijkstras
+
+# Size of the area nodes are placed in, matching the window
+WIDTH, HEIGHT = 600, 500
+
+def geometric_graph(graph: BaseGraph, size: int, rng: random.Random) -> None:
+    """Places nodes at random, joining each to the nodes within a radius
+    chosen to give an average of about six edges per node"""
+    radius = math.sqrt(6 * WIDTH * HEIGHT / (math.pi * size))
+
+    # Nodes are bucketed by position so only nearby nodes are compared
+    buckets: dict[tuple[int, int], list] = {}
+    for i in range(size):
+        node = graph.new_node(rng.randint(0, WIDTH - 1), rng.randint(0, HEIGHT - 1), f"Node{i}")
+        graph.insert_node(node)
+        buckets.setdefault((int(node.x // radius), int(node.y // radius)), []).append((i, node))
+
+    for ((bx, by), nodes) in buckets.items():
+        nearby = [item for dx in (-1, 0, 1) for dy in (-1, 0, 1) for item in buckets.get((bx+dx, by+dy), [])]
+        for (i, node) in nodes:
+            for (j, other) in nearby:
+                # Each pair is joined once, from the node added first
+                distance = math.dist((node.x, node.y), (other.x, other.y))
+                if i < j and distance <= radius:
+                    graph.insert_edge(graph.new_edge(node, other, max(1, round(distance))))
+
+def grid_graph(graph: BaseGraph, size: int, rng: random.Random) -> None:
+    """Places nodes in a square grid, joining each to the nodes beside and below it"""
+    columns = max(1, round(math.sqrt(size)))
+    rows = math.ceil(size / columns)
+    gap = min(WIDTH / columns, HEIGHT / rows)
+
+    nodes = {}
+    for i in range(size):
+        row, column = divmod(i, columns)
+        nodes[(row, column)] = graph.new_node(column * gap, row * gap, f"Node{i}")
+        graph.insert_node(nodes[(row, column)])
+
+    for ((row, column), node) in nodes.items():
+        for other in [nodes.get((row, column + 1)), nodes.get((row + 1, column))]:
+            if other is not None:
+                graph.insert_edge(graph.new_edge(node, other, rng.randint(1, 50)))
+
+def dense_graph(graph: BaseGraph, size: int, rng: random.Random) -> None:
+    """Places a tenth as many nodes at random, joining each pair half of the time"""
+    nodes = []
+    for i in range(max(2, size // 10)):
+        nodes.append(graph.new_node(rng.randint(0, WIDTH - 1), rng.randint(0, HEIGHT - 1), f"Node{i}"))
+        graph.insert_node(nodes[-1])
+
+    for (i, node) in enumerate(nodes):
+        for other in nodes[i + 1:]:
+            if rng.random() < 0.5:
+                graph.insert_edge(graph.new_edge(node, other, rng.randint(1, 50)))
+
+# Generators by the name used on the command line
+GENERATORS: dict[str, Callable[[BaseGraph, int, random.Random], None]] = {
+    "geometric": geometric_graph,
+    "grid": grid_graph,
+    "dense": dense_graph
+}
+
+def best_time(function: Callable[[], None], repeats: int, setup: Union[Callable[[], None], None] = None) -> float:
+    """Returns the fastest of several timed runs of a function"""
+    times = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+def single_source(graph: BaseGraph) -> Dijkstras:
+    """Returns dijkstras from the first node to an added node nothing joins, so it
+    visits every node the start reaches however the graph is laid out"""
+    end = BaseNode(0, 0, "Unreachable")
+    graph.insert_node(end)
+    return Dijkstras(graph, [*graph.nodes][0], end)
+
+def bench_graph(graph: Graph, screen: pygame.Surface, repeats: int) -> dict[str, float]:
+    """Times each operation on a graph, returning the seconds each took"""
+    settings = graph.settings
+    nodes = [*graph.nodes]
+    results = {}
+
+    # Each algorithm runs on its own copy, as the user interface does
+    algorithms = {
+        "prims": lambda g: Prims([*g.nodes][0], g),
+        "kruskals": lambda g: Kruskals(g),
+        "dijkstras": single_source
+    }
+    for (name, create) in algorithms.items():
+        runs = []
+        results[name] = best_time(lambda: runs[-1].finish(), repeats, lambda: runs.append(create(graph.algorithm_copy())))
+
+        # The copies share nodes and edges with the graph, so remove their highlights
+        for run in runs:
+            run.clear_up()
+
+    results["copy"] = best_time(graph.copy, repeats)
+
+    # Save and load in both file formats
+    with tempfile.TemporaryDirectory() as folder:
+        for extension in [".json", BINARY_EXTENSION]:
+            path = os.path.join(folder, f"graph{extension}")
+            label = extension.lstrip(".")
+            results[f"save_{label}"] = best_time(lambda: graph.save_file(path), repeats)
+
+            def load() -> None:
+                loaded = Graph(settings)
+                loaded.load_file(path)
+                loaded.rebuild_index()
+            results[f"load_{label}"] = best_time(load, repeats)
+
+    # Drawing without the cached layer, building the layer, and drawing from the layer
+    mouse_pos = (-100, -100)
+    settings.cached_render = False
+    results["draw_direct"] = best_time(lambda: graph.draw(mouse_pos, screen), repeats)
+
+    settings.cached_render = True
+    def rebuild() -> None:
+        graph.redraw_layer = True
+    results["draw_layer_build"] = best_time(lambda: graph.draw(mouse_pos, screen), repeats, rebuild)
+    results["draw_cached"] = best_time(lambda: graph.draw(mouse_pos, screen), repeats)
+
+    # Drawing a frame after a node has been highlighted
+    node = nodes[len(nodes) // 2]
+    def change() -> None:
+        node.highlight()
+        node.unhighlight()
+    results["draw_changed"] = best_time(lambda: graph.draw(mouse_pos, screen), repeats, change)
+
+    return results
+
+def git_commit() -> Union[str, None]:
+    """Returns the commit being benchmarked, if in a git repository"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(old: dict, new: dict) -> None:
+    """Prints how long each operation took compared with an earlier run"""
+    before = dict([
+        ((r["generator"], r["size"], r["operation"]), r["seconds"])
+        for r in old["results"]
+        ])
+
+    print(f"{'generator':<10} {'size':>6} {'operation':<17} {'before':>10} {'after':>10} {'ratio':>6}")
+    for r in new["results"]:
+        key = (r["generator"], r["size"], r["operation"])
+        if key in before and before[key] > 0:
+            print(f"{r['generator']:<10} {r['size']:>6} {r['operation']:<17} "
+                  f"{before[key]:>10.5f} {r['seconds']:>10.5f} {r['seconds'] / before[key]:>6.2f}")
+
+def main(args: Union[list[str], None] = None) -> None:
+    """Benchmarks the algorithms, copying, saving, loading and drawing on generated graphs"""
+    parser = argparse.ArgumentParser(description="Benchmark graph operations on generated graphs")
+    parser.add_argument("-g", "--generators", nargs="+", choices=[*GENERATORS], default=[*GENERATORS])
+    parser.add_argument("-s", "--sizes", nargs="+", type=int, default=[100, 500, 1000, 5000], help="number of nodes in each graph")
+    parser.add_argument("-r", "--repeats", type=int, default=3, help="runs of each operation, the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="benchmark.json", help="file to write results to")
+    parser.add_argument("-c", "--compare", help="earlier results file to compare against")
+    options = parser.parse_args(args)
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    output = {
+        "meta": {
+            "commit": git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "repeats": options.repeats,
+            "seed": options.seed
+        },
+        "results": []
+    }
+
+    for generator in options.generators:
+        for size in options.sizes:
+            # Build the same graph every run, so results can be compared
+            settings = Settings(WIDTH, HEIGHT)
+            graph = Graph(settings)
+            GENERATORS[generator](graph, size, random.Random(options.seed))
+            graph.rebuild_index()
+
+            for (operation, seconds) in bench_graph(graph, screen, options.repeats).items():
+                output["results"].append({
+                    "generator": generator, "size": size,
+                    "nodes": len(graph.nodes), "edges": len(graph.edges),
+                    "operation": operation, "seconds": seconds
+                    })
+                print(f"{generator:<10} {size:>6} {operation:<17} {seconds:>10.5f}", file=sys.stderr)
+
+    with open(options.output, "w") as f:
+        json.dump(output, f, indent=2)
+
+    if options.compare:
+        with open(options.compare) as f:
+            compare(json.load(f), output)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
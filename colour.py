@@ -1,20 +1,60 @@
+def hsv_to_rgb(h: int, s: float, v: float) -> tuple[int, int, int]:
+    """Converts a hsv colour to rgb"""
+    # Use hsv to rgb algorithm to convert
+    c = s * v
+    x = c * (1 - abs((h//6)%2 - 1))
+    m = v - c
+
+    # Colour list to get r, g and b values
+    colour = [0, 0, 0]
+
+    # Get x position and set to x
+    x_pos = (10 - h // 60)%3
+    colour[x_pos] = x
+
+    # Get c position and set to c
+    c_pos = ((h+60)//120)%3
+    colour[c_pos] = c
+
+    # Get r, g and b values
+    r, g, b = [int((col+m)*255) for col in colour]
+
+    return (r, g, b)
+
+# Rgb of the states nodes, edges and buttons switch between when highlighted,
+# worked out once so highlighting only needs a lookup
+RGB_TABLE: dict[tuple[int, float, float], tuple[int, int, int]] = dict([
+    ((h, s, v), hsv_to_rgb(h, s, v)) for (h, s, v) in [
+        # Node hues
+        (0, 1, 1), (120, 1, 1), (240, 1, 1),
+        # Edge brightness
+        (0, 0, 0), (0, 0, 0.5), (0, 0, 1),
+        # Hovered buttons
+        (0, 0, 0.8)
+    ]])
+
 class Colour:
     """Handles hsv colours"""
+    __slots__ = ("_h", "_s", "_v", "_rgb")
+
     def __init__(self, hue: int, saturation: float, value: float) -> None:
         """Initialising function for colour class"""
         if type(hue) != int:
             raise BaseException("Hue of unexpected type")
-        if any([type(a) not in [int, float] for a in [saturation, value]]):
+        if type(saturation) not in (int, float) or type(value) not in (int, float):
             raise BaseException("Unexpected argument type")
         if not 0 <= hue <= 360:
             raise BaseException("Hue takes wrong value")
-        if any([not 0 <= a <= 1 for a in [saturation, value]]):
+        if not (0 <= saturation <= 1 and 0 <= value <= 1):
             raise BaseException("Arguments take unexpected value")
         # Create instance variables
         self._h = hue
         self._s = saturation
         self._v = value
 
+        # Rgb value, worked out when first needed
+        self._rgb = None
+
     @property
     def v(self) -> float:
         return self._v
@@ -28,6 +68,7 @@ class Colour:
             self._v = 0
         else:
             self._v = val
+        self._rgb = None
 
     @property
     def h(self) -> int:
@@ -37,29 +78,16 @@ class Colour:
     def h(self, val: int) -> None:
         # Enforce that 0 <= val <= 360
         self._h = val % 360
-    
+        self._rgb = None
+
     @property
     def rgb(self) -> tuple[int, int, int]:
-        # Use hsv to rgb algorithm to convert
-        c = self._s * self._v
-        x = c * (1 - abs((self._h//6)%2 - 1))
-        m = self._v - c
-
-        # Colour list to get r, g and b values
-        colour = [0, 0, 0]
-
-        # Get x position and set to x
-        x_pos = (10 - self._h // 60)%3
-        colour[x_pos] = x
-
-        # Get c position and set to c
-        c_pos = ((self._h+60)//120)%3
-        colour[c_pos] = c
-
-        # Get r, g and b values
-        r, g, b = [int((col+m)*255) for col in colour]
+        # Only convert again if the colour has changed
+        if self._rgb is None:
+            hsv = (self._h, self._s, self._v)
+            self._rgb = RGB_TABLE[hsv] if hsv in RGB_TABLE else hsv_to_rgb(*hsv)
 
-        return (r, g, b) 
+        return self._rgb
 
     @property
     def hsv(self) -> tuple[int, float, float]:
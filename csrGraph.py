@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+# Import base libraries
+import heapq
+import numpy as np
+from typing import Union, TYPE_CHECKING
+
+# Block off for type checking so cyclic import does not occur
+if TYPE_CHECKING:
+    from graphCore import BaseGraph as Graph, BaseNode as Node, BaseEdge as Edge
+
+# Compressed sparse row graph class
+class CSRGraph:
+    """Array snapshot of a graph, nodes and edges are numbered and each node's
+    neighbours are stored one after another so algorithms work on integers"""
+    def __init__(self, graph: Graph) -> None:
+        """Initialisation function of the compressed sparse row graph class"""
+        # Number the nodes and edges, the numbers map results back to the graph
+        self.nodes: list[Node] = [*graph.nodes]
+        self.edges: list[Edge] = [*graph.edges]
+        self.node_index: dict[Node, int] = dict([(node, i) for (i, node) in enumerate(self.nodes)])
+
+        # Endpoints and weight of each edge
+        count = len(self.edges)
+        self.edge_starts = np.fromiter((self.node_index[edge.A] for edge in self.edges), dtype=np.int64, count=count)
+        self.edge_ends = np.fromiter((self.node_index[edge.B] for edge in self.edges), dtype=np.int64, count=count)
+        self.edge_weights = np.fromiter((edge.weight for edge in self.edges), dtype=np.int64, count=count)
+
+        # Each edge is stored once in each direction, sorted by the node it leaves
+        sources = np.concatenate([self.edge_starts, self.edge_ends])
+        order = np.argsort(sources, kind="stable")
+        self.targets = np.concatenate([self.edge_ends, self.edge_starts])[order]
+        self.weights = np.concatenate([self.edge_weights, self.edge_weights])[order]
+        self.edge_ids = np.concatenate([np.arange(count), np.arange(count)])[order]
+
+        # The neighbours of node i are at positions offsets[i] to offsets[i+1]
+        self.offsets = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(self.nodes)), out=self.offsets[1:])
+
+    def neighbours(self, i: int) -> np.ndarray:
+        """Returns the numbers of the nodes joined to node i"""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def dijkstras(self, start: int, end: Union[int, None] = None) -> tuple[list, list]:
+        """Runs dijkstra's algorithm from the start node, stopping once the end node
+        is reached if given, returns the distance to each node and the edge used
+        to reach it, None where not reached"""
+        # Plain lists are much faster to index one item at a time than arrays
+        offsets = self.offsets.tolist()
+        targets = self.targets.tolist()
+        weights = self.weights.tolist()
+        edge_ids = self.edge_ids.tolist()
+
+        distance: list[Union[int, None]] = [None] * len(self.nodes)
+        via: list[Union[int, None]] = [None] * len(self.nodes)
+        best: list[Union[int, None]] = [None] * len(self.nodes)
+        best[start] = 0
+        queue = [(0, start)]
+
+        while queue:
+            weight, node = heapq.heappop(queue)
+
+            # Skip nodes already reached by a shorter route
+            if distance[node] is not None:
+                continue
+            distance[node] = weight
+            if node == end:
+                break
+
+            for k in range(offsets[node], offsets[node + 1]):
+                target = targets[k]
+                new_weight = weight + weights[k]
+                if distance[target] is None and (best[target] is None or new_weight < best[target]):
+                    best[target] = new_weight
+                    via[target] = edge_ids[k]
+                    heapq.heappush(queue, (new_weight, target))
+
+        return distance, via
+
+    def path(self, via: list, start: int, end: int) -> list[int]:
+        """Returns the nodes on the route to the end found by dijkstras, empty if not reached"""
+        if end != start and via[end] is None:
+            return []
+
+        # Walk back along the edge used to reach each node
+        path = [end]
+        while path[-1] != start:
+            edge = via[path[-1]]
+            a, b = int(self.edge_starts[edge]), int(self.edge_ends[edge])
+            path.append(a if b == path[-1] else b)
+
+        return path[::-1]
+
+    def prims(self, start: int) -> list[int]:
+        """Runs prims algorithm from the start node, returns the chosen edges,
+        starting new trees when the graph is disconnected"""
+        offsets = self.offsets.tolist()
+        targets = self.targets.tolist()
+        weights = self.weights.tolist()
+        edge_ids = self.edge_ids.tolist()
+
+        visited = [False] * len(self.nodes)
+        chosen = []
+
+        # Grow a tree from the start node, then from each node not yet reached
+        for root in [start, *range(len(self.nodes))]:
+            if visited[root]:
+                continue
+            visited[root] = True
+            frontier = [(weights[k], k) for k in range(offsets[root], offsets[root + 1])]
+            heapq.heapify(frontier)
+
+            while frontier:
+                _, k = heapq.heappop(frontier)
+                node = targets[k]
+                if visited[node]:
+                    continue
+
+                # Take the edge and add the edges leaving the new node
+                visited[node] = True
+                chosen.append(edge_ids[k])
+                for j in range(offsets[node], offsets[node + 1]):
+                    if not visited[targets[j]]:
+                        heapq.heappush(frontier, (weights[j], j))
+
+        return chosen
+
+    def kruskals(self) -> list[int]:
+        """Runs kruskals algorithm, returns the chosen edges in the order picked"""
+        # Sort the edges by weight, ties keep the graph's edge order
+        order = np.argsort(self.edge_weights, kind="stable").tolist()
+        starts = self.edge_starts.tolist()
+        ends = self.edge_ends.tolist()
+
+        # Disjoint set forest over node numbers
+        parent = list(range(len(self.nodes)))
+        chosen = []
+
+        for edge in order:
+            # Find the root of each endpoint, halving the path as it goes
+            a, b = starts[edge], ends[edge]
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+
+            # Edges joining two trees are kept
+            if a != b:
+                parent[a] = b
+                chosen.append(edge)
+                if len(chosen) == len(self.nodes) - 1:
+                    break
+
+        return chosen
+
+    def node_list(self, numbers: list[int]) -> list[Node]:
+        """Returns the nodes with the given numbers"""
+        return [self.nodes[i] for i in numbers]
+
+    def edge_list(self, numbers: list[int]) -> list[Edge]:
+        """Returns the edges with the given numbers"""
+        return [self.edges[i] for i in numbers]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+# Import base libraries
+import numpy as np
+from typing import Union, TYPE_CHECKING
+
+# Block off for type checking so cyclic import does not occur
+if TYPE_CHECKING:
+    from graph import Edge
+
+# Edge hit test class
+class EdgeHitTest:
+    """Keeps the end points of every edge in an array, so the edges under the
+    mouse can be found in one vectorised pass"""
+    def __init__(self, capacity: int = 64) -> None:
+        """Initialisation function of the edge hit test class"""
+        # Create instance variables, each row holds ax, ay, bx, by and half the line width
+        self.table = np.zeros((capacity, 5))
+        self.edges: list[Edge] = []
+        self.rows: dict[Edge, int] = {}
+
+    def update(self, edge: Edge) -> None:
+        """Adds an edge, or updates its row if the end points have moved"""
+        if edge not in self.rows:
+            # Double the size of the table when it is full
+            if len(self.edges) == len(self.table):
+                self.table = np.concatenate([self.table, np.zeros_like(self.table)])
+
+            self.rows[edge] = len(self.edges)
+            self.edges.append(edge)
+
+        self.table[self.rows[edge]] = (edge.A.x, edge.A.y, edge.B.x, edge.B.y, edge.WIDTH / 2)
+
+    def remove(self, edge: Edge) -> None:
+        """Removes an edge, moving the last row into its place"""
+        row = self.rows.pop(edge, None)
+        if row is None:
+            return
+
+        last = self.edges.pop()
+        if last is not edge:
+            self.edges[row] = last
+            self.rows[last] = row
+            self.table[row] = self.table[len(self.edges)]
+
+    def clear(self) -> None:
+        """Removes every edge"""
+        self.edges = []
+        self.rows = {}
+
+    def query(self, pos: tuple[int, int], candidates: Union[list[Edge], None] = None) -> list[Edge]:
+        """Returns the edges the point is over, checking only the candidates if given"""
+        if candidates is None:
+            rows = np.arange(len(self.edges))
+        else:
+            rows = np.fromiter((self.rows[edge] for edge in candidates if edge in self.rows), dtype=np.int64)
+
+        ax, ay, bx, by, half_width = self.table[rows].T
+        x, y = pos
+
+        # Project the point onto each edge, the projection must land between the
+        # end points and the point must be within half the width of the line,
+        # which covers horizontal and vertical edges without dividing by a gradient
+        dx, dy = bx - ax, by - ay
+        px, py = x - ax, y - ay
+        length_squared = dx*dx + dy*dy
+        along = px*dx + py*dy
+        across = px*dy - py*dx
+        hit = (along >= 0) & (along <= length_squared) & (across*across <= half_width*half_width*length_squared)
+
+        # Edges between nodes in the same place use the distance to the node
+        point = length_squared == 0
+        hit[point] = (px[point]**2 + py[point]**2) <= half_width[point]**2
+
+        return [self.edges[row] for row in rows[hit]]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+# Import base libraries
+import os
+import threading
+from typing import Callable, Union
+
+# Import custom scripts
+from fontCache import font_registry
+from graph import Graph
+from graphCore import BaseGraph
+from settings import Settings
+
+# File worker class
+class FileWorker:
+    """Saves and loads graphs on a background thread, so the window keeps running"""
+    def __init__(self, settings: Settings) -> None:
+        """Initialisation function of the file worker class"""
+        # Create instance variables
+        self.settings = settings
+        self.thread: Union[threading.Thread, None] = None
+        self.action = ""
+        self.progress: Union[float, None] = None
+        self.result: Union[Graph, None] = None
+        self.error: Union[Exception, None] = None
+
+        # Help message shown when the work started, put back once it is done,
+        # and the last message the worker showed, which is not put back
+        self.previous_text = ""
+        self.shown_text = ""
+
+    @property
+    def busy(self) -> bool:
+        return self.thread is not None
+
+    def start(self, action: str, work: Callable[[], Union[Graph, None]]) -> None:
+        """Runs the work on a new thread"""
+        self.action = action
+        self.previous_text = self.settings.help_label.text if self.settings.help_label.text != self.shown_text else ""
+        self.progress = None
+        self.result = None
+        self.error = None
+        self.thread = threading.Thread(target=self.run, args=(work,), daemon=True)
+        self.thread.start()
+
+    def run(self, work: Callable[[], Union[Graph, None]]) -> None:
+        """Function run on the worker thread"""
+        try:
+            self.result = work()
+        except Exception as e:
+            # Keep the error to report on the main thread
+            self.error = e
+
+    def set_progress(self, fraction: float) -> None:
+        """Records how far through the work the thread is"""
+        self.progress = fraction
+
+    def save(self, graph: Graph, file_name: str) -> Union[str, None]:
+        """Starts saving the graph to a file"""
+        if self.busy or not graph.valid_name(file_name):
+            return "Error"
+
+        # Copy the adjacency list now, so edits made while saving do not change what is saved
+        snapshot = graph.copy_into(BaseGraph())
+        path = graph.graph_path(file_name)
+
+        self.start("Saving", lambda: snapshot.save_file(path))
+
+    def load(self, graph: Graph, file_name: str) -> Union[str, None]:
+        """Starts loading a graph from a file"""
+        if self.busy or not os.path.exists(graph.graph_path(file_name)):
+            return "Error"
+
+        # Load the fonts nodes and edges use here, as pygame fonts are not thread safe
+        font_registry.get(self.settings.font, 10)
+        font_registry.get(self.settings.font, 15)
+
+        # Load into a separate graph, which is swapped in once finished
+        loaded = Graph(self.settings)
+        path = graph.graph_path(file_name)
+
+        def work() -> Graph:
+            loaded.load_file(path, self.set_progress)
+            loaded.rebuild_index()
+            return loaded
+
+        self.start("Loading", work)
+
+    def show(self, text: str) -> None:
+        """Shows a message about the work in the help label"""
+        self.settings.help_label.text = text
+        self.shown_text = text
+
+    def update(self, graph: Graph) -> None:
+        """Function run each frame, showing progress and finishing work once the thread is done"""
+        if self.thread is None:
+            return
+
+        # Show progress while the thread is running
+        if self.thread.is_alive():
+            if self.progress is None:
+                self.show(f"{self.action} graph...")
+            else:
+                self.show(f"{self.action} graph... {int(self.progress*100)}%")
+            return
+
+        self.thread.join()
+        self.thread = None
+
+        if self.error is not None:
+            self.show(f"{self.action} failed: {self.error}")
+            return
+
+        # Swap in the loaded graph between frames, which stops any algorithm on the old graph
+        if self.result is not None:
+            graph.swap_in(self.result)
+            self.show(f"{self.action} finished")
+        elif self.previous_text != "":
+            # Put back the message from before saving, as it may be a prompt still being followed
+            self.settings.help_label.text = self.previous_text
+        else:
+            self.show(f"{self.action} finished")
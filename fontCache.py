@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+# Import base libraries
+import pygame
+from collections import OrderedDict
+from typing import Union
+
+# Initialise pygame font library
+pygame.font.init()
+
+# Font registry class
+class FontRegistry:
+    """Loads each system font once and shares it between every element"""
+    def __init__(self) -> None:
+        """Initialisation function of the font registry class"""
+        # Create instance variables
+        self.fonts: dict[tuple[str, int], pygame.font.Font] = {}
+
+    def get(self, family: str, size: int) -> pygame.font.Font:
+        """Returns the font of the given family and size, loading it if needed"""
+        key = (family, size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.SysFont(family, size)
+
+        return self.fonts[key]
+
+    def clear(self) -> None:
+        """Forgets every loaded font"""
+        self.fonts.clear()
+
+# Text cache class
+class TextCache:
+    """Least recently used cache of rendered text surfaces"""
+    def __init__(self, max_size: int = 4096) -> None:
+        """Initialisation function of the text cache class"""
+        # Create instance variables
+        self.max_size = max_size
+        self.surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(
+        self, font: pygame.font.Font, text: str,
+        colour: tuple[int, int, int],
+        background: Union[tuple[int, int, int], None] = None
+        ) -> pygame.Surface:
+        """Returns the text rendered in the font, rendering it only if not cached"""
+        key = (font, text, colour, background)
+
+        # If already rendered, mark as recently used and return it
+        if key in self.surfaces:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return self.surfaces[key]
+
+        # Render the text and store it
+        self.misses += 1
+        surface = font.render(text, True, colour, background)
+        self.surfaces[key] = surface
+
+        # Remove the least recently used surface if the cache is full
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+
+        return surface
+
+    def clear(self) -> None:
+        """Empties the cache and resets the counters"""
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+# Registry and cache shared by every element that draws text
+font_registry = FontRegistry()
+text_cache = TextCache()
@@ -1,14 +1,22 @@
 # Import base libraries
 import pygame
-import json
 import os
 from typing import Union
 
 # Import custom scripts
 import guiElements
 from colour import Colour
+from fontCache import font_registry, text_cache
+from spatialGrid import SpatialGrid
+from graphCore import BaseNode, BaseEdge, BaseGraph, BINARY_EXTENSION
 from settings import Settings
-from algorithms import Prims, Dijkstras
+from algorithms import Prims, Dijkstras, AStar, BidirectionalDijkstras
+
+# Edge hover testing uses NumPy when it is installed
+try:
+    from edgeHitTest import EdgeHitTest
+except ImportError:
+    EdgeHitTest = None
 
 # Initialise the python font library
 pygame.font.init()
@@ -16,39 +24,56 @@ pygame.font.init()
 def wordFilter(word):
     ...
 
-class Node:
+class Node(BaseNode):
     """Class to handle nodes"""
+    # Text colours never change, so are shared by every node
+    TEXT_COLOUR = Colour(0, 0, 0)
+    TEXT_BG = Colour(0, 0, 1)
+
     def __init__(self, x: Union[int, float], y: Union[int, float], name: str, settings: Settings) -> None:
         """Initialisation function of node class"""
-        # Check that arguments are of correct type
-        if any([type(v) not in [int, float] for v in [x, y]]):
-            raise BaseException("Entered wrong type")
-        if type(name) not in [str, int, float]:
-            raise BaseException("Entered wrong type for name")
+        # Run parent initialisation function
+        super().__init__(x, y, name)
 
         # Create instance variables
-        self.x = x
-        self.y = y
-        self.name = str(name)
-        self.show_name = False
+        self._show_name = False
         self.colour = Colour(0, 1, 1)
         self.settings = settings
 
         # Create instance constants
         self.RADIUS = 10
-        self.TEXT_COLOUR = Colour(0, 0, 0)
-        self.TEXT_BG = Colour(0, 0, 1)
-        self.FONT = pygame.font.SysFont(self.settings.font, 10)
+
+    @property
+    def font(self) -> pygame.font.Font:
+        """Font the name is drawn in, looked up each time so a change of font is used"""
+        return font_registry.get(self.settings.font, 10)
 
     def highlight(self) -> None:
         """Function to highlight the node"""
         # Up the hue of the colour
         self.colour.h = self.colour.h + 120
+        self.mark_dirty()
 
     def unhighlight(self) -> None:
         """Function to unhighlight the node"""
         # Down the hue of the colour
         self.colour.h = self.colour.h - 120
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        """Flags the node to be redrawn on the cached graph layer"""
+        self.settings.dirty_elements[self] = None
+
+    @property
+    def show_name(self) -> bool:
+        return self._show_name
+
+    @show_name.setter
+    def show_name(self, val: bool) -> None:
+        # Redraw the node if the name is shown or hidden
+        if val != self._show_name:
+            self.mark_dirty()
+        self._show_name = val
 
     def on_hover(self, mouse_pos: tuple[int, int]) -> bool:
         """Function to check whether node is hovered over"""
@@ -65,6 +90,18 @@ class Node:
 
         return False
 
+    def get_rect(self) -> pygame.Rect:
+        """Returns the area of the screen the node is drawn over"""
+        # Area covered by the circle
+        rect = pygame.Rect(self.x-self.RADIUS-1, self.y-self.RADIUS-1, self.RADIUS*2+2, self.RADIUS*2+2)
+
+        # Add the area covered by the name if it is shown
+        if self.show_name or self.settings.show_names:
+            width, height = text_cache.render(self.font, self.name, self.TEXT_COLOUR.rgb, self.TEXT_BG.rgb).get_size()
+            rect.union_ip((self.x-width/2-1, self.y-self.RADIUS-height-1, width+2, height+2))
+
+        return rect
+
     def draw(self, screen: pygame.Surface) -> None:
         """Function to draw the node"""
         # Draw circle for node
@@ -74,7 +111,7 @@ class Node:
         if self.show_name or self.settings.show_names:
 
             # Render name as text
-            self.render = self.FONT.render(self.name, True, self.TEXT_COLOUR.rgb, self.TEXT_BG.rgb)
+            self.render = text_cache.render(self.font, self.name, self.TEXT_COLOUR.rgb, self.TEXT_BG.rgb)
 
             # Display text to screen
             screen.blit(
@@ -83,37 +120,56 @@ class Node:
                 )
 
 # Edge class
-class Edge:
+class Edge(BaseEdge):
     """Class to handle creation of edges"""
+    # Text colours never change, so are shared by every edge
+    TEXT_COLOUR = Colour(0, 0, 0)
+    TEXT_BG = Colour(0, 0, 1)
+
     def __init__(self, start_node: Node, end_node: Node, weight: int, settings: Settings) -> None:
         """Initialisation function of edge class"""
-        if type(weight) != int:
-            raise BaseException("Entered wrong type for weight")
-        if any(type(n) != Node for n in [start_node, end_node]):
-            raise BaseException("Entered wrong type for nodes")
+        # Run parent initialisation function
+        super().__init__(start_node, end_node, weight)
+
         # Create instance variables
-        self.A = start_node
-        self.B = end_node
-        self.weight = weight
         self.colour = Colour(0, 0, 0)
-        self.show_weight = False
+        self._show_weight = False
         self.settings = settings
 
         # Constants
         self.WIDTH = 10
-        self.TEXT_COLOUR = Colour(0, 0, 0)
-        self.TEXT_BG = Colour(0, 0, 1)
-        self.FONT = pygame.font.SysFont(self.settings.font, 15)
+
+    @property
+    def font(self) -> pygame.font.Font:
+        """Font the weight is drawn in, looked up each time so a change of font is used"""
+        return font_registry.get(self.settings.font, 15)
 
     def highlight(self) -> None:
         """Function to highlight the edge"""
         # Increase brightness by 50%
         self.colour.v = self.colour.v + 0.5
+        self.mark_dirty()
 
     def unhighlight(self) -> None:
         """Function to unhighlight the edge"""
         # Decrease brightness by 50%
         self.colour.v = self.colour.v - 0.5
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        """Flags the edge to be redrawn on the cached graph layer"""
+        self.settings.dirty_elements[self] = None
+
+    @property
+    def show_weight(self) -> bool:
+        return self._show_weight
+
+    @show_weight.setter
+    def show_weight(self, val: bool) -> None:
+        # Redraw the edge if the weight is shown or hidden
+        if val != self._show_weight:
+            self.mark_dirty()
+        self._show_weight = val
 
     def on_hover(self, mouse_pos: tuple[int, int]) -> bool:
         """Check whether the edge is hovered over"""
@@ -165,15 +221,38 @@ class Edge:
         self.show_weight = False
         return False
     
+    def get_rect(self) -> pygame.Rect:
+        """Returns the area of the screen the edge is drawn over"""
+        # Area covered by the line, widened by the line width
+        rect = pygame.Rect(
+            min(self.A.x, self.B.x), min(self.A.y, self.B.y),
+            abs(self.A.x-self.B.x)+1, abs(self.A.y-self.B.y)+1
+            ).inflate(self.WIDTH+2, self.WIDTH+2)
+
+        # Add the area covered by the weight if it is shown
+        if self.show_weight or self.settings.show_weight:
+            width, height = text_cache.render(self.font, str(self.weight), self.TEXT_COLOUR.rgb, self.TEXT_BG.rgb).get_size()
+            rect.union_ip(((self.A.x+self.B.x-width)/2-1, (self.A.y+self.B.y-height)/2-1, width+2, height+2))
+
+        return rect
+
     def draw(self, screen: pygame.Surface) -> None:
         """Displays the edge to the screen"""
-        # Draw a line to represent the edge
-        pygame.draw.line(screen, self.colour.rgb, (self.A.x, self.A.y), (self.B.x, self.B.y), self.WIDTH)
+        # Draw a thick line to represent the edge, drawn as a polygon
+        # as thick lines are cut short when only part of the screen is redrawn
+        if abs(self.A.x-self.B.x) >= abs(self.A.y-self.B.y):
+            offset_x, offset_y = 0, self.WIDTH/2
+        else:
+            offset_x, offset_y = self.WIDTH/2, 0
+        pygame.draw.polygon(screen, self.colour.rgb, [
+            (self.A.x-offset_x, self.A.y-offset_y), (self.B.x-offset_x, self.B.y-offset_y),
+            (self.B.x+offset_x, self.B.y+offset_y), (self.A.x+offset_x, self.A.y+offset_y)
+            ])
 
         # Test if showing weight
         if self.show_weight or self.settings.show_weight:
             # IF showing weight render the weight as a surface
-            self.render = self.FONT.render(str(self.weight), True, self.TEXT_COLOUR.rgb, self.TEXT_BG.rgb)
+            self.render = text_cache.render(self.font, str(self.weight), self.TEXT_COLOUR.rgb, self.TEXT_BG.rgb)
 
             # Blit the text to the screen
             screen.blit(self.render, (
@@ -182,15 +261,35 @@ class Edge:
 
 
 # Graph class
-class Graph:
+class Graph(BaseGraph):
     """Class to handle graphs"""
     def __init__(self, settings: Union[Settings, None] = None) -> None:
         """Initialisation function of graph class"""
+        # Run parent initialisation function
+        super().__init__()
+
         # Create instance variables
-        self.adjacency_lists: dict[Node, dict[Node, Edge]] = {}
+        self.node_grid = SpatialGrid()
+        self.edge_grid = SpatialGrid()
+        self.edge_hits = EdgeHitTest() if EdgeHitTest is not None else None
+        self.hovered_nodes: list[Node] = []
+        self.hovered_edges: list[Edge] = []
         self.current_setting: Union[Node, Edge, None] = None
         self.clicked_node = None
 
+        # Off-screen layer holding the drawn graph, with the area each element covers
+        self.layer: Union[pygame.Surface, None] = None
+        self.layer_grid = SpatialGrid()
+        self.drawn_rects: dict[Union[Node, Edge], pygame.Rect] = {}
+        self.draw_order: dict[Union[Node, Edge], int] = {}
+        self.draw_count = 0
+        self.redraw_layer = True
+        self.drawn_font: Union[str, None] = None
+
+        # Areas of the overlays drawn above the graph last frame
+        self.drawn_line: Union[pygame.Rect, None] = None
+        self.drawn_menu = False
+
         # Create instance constants
         self.S_HEIGHT = 100
         self.S_WIDTH = 150
@@ -203,13 +302,61 @@ class Graph:
         self.DELETE_BUTTON = guiElements.Button(self.S_X+self.PADDING, self.PADDING*3+40, 50, 20, "Delete", settings, "Delete Node/Edge")
         self.settings = settings
 
+    def new_node(self, x: Union[int, float], y: Union[int, float], name: str) -> Node:
+        """Creates a node which can be drawn"""
+        return Node(x, y, name, self.settings)
+
+    def new_edge(self, start_node: Node, end_node: Node, weight: int) -> Edge:
+        """Creates an edge which can be drawn"""
+        return Edge(start_node, end_node, weight, self.settings)
+
     def add_node(self, mouse_pos: tuple[int, int]) -> None:
         """Adds node to the graph"""
         # Create a new node
         new_node = Node(*mouse_pos, f"NewNode{len(self.adjacency_lists)}", self.settings)
 
         # Update the adjacency list with the new node
-        self.adjacency_lists.update({new_node: {}})
+        self.insert_node(new_node)
+        self.index_node(new_node)
+        new_node.mark_dirty()
+
+    def index_node(self, node: Node) -> None:
+        """Updates the position of a node in the spatial grid"""
+        self.node_grid.insert(node, self.node_grid.rect_cells(
+            (node.x-node.RADIUS, node.y-node.RADIUS, node.RADIUS*2, node.RADIUS*2)))
+
+    def index_edge(self, edge: Edge) -> None:
+        """Updates the position of an edge in the spatial grid"""
+        self.edge_grid.insert(edge, self.edge_grid.segment_cells(
+            (edge.A.x, edge.A.y), (edge.B.x, edge.B.y), edge.WIDTH/2))
+        if self.edge_hits is not None:
+            self.edge_hits.update(edge)
+
+    def unindex_edge(self, edge: Edge) -> None:
+        """Removes an edge from the spatial grid"""
+        self.edge_grid.remove(edge)
+        if self.edge_hits is not None:
+            self.edge_hits.remove(edge)
+
+    def move_node(self, node: Node, pos: tuple[int, int]) -> None:
+        """Moves a node, keeping it and its edges up to date in the grids"""
+        node.x, node.y = pos
+        self.index_node(node)
+        node.mark_dirty()
+        for edge in self.adjacency_lists[node].values():
+            self.index_edge(edge)
+            edge.mark_dirty()
+
+    def rebuild_index(self) -> None:
+        """Rebuilds the spatial grids from scratch"""
+        self.node_grid.clear()
+        self.edge_grid.clear()
+        if self.edge_hits is not None:
+            self.edge_hits.clear()
+        for node in self.nodes:
+            self.index_node(node)
+        for edge in self.edges:
+            self.index_edge(edge)
 
     def add_edge(self, start_node: Node, end_node: Node) -> None:
         """Adds an edge to the graph"""
@@ -217,47 +364,39 @@ class Graph:
         edge = Edge(start_node, end_node, 0, self.settings)
 
         # Update adjacency list for both start and end node
-        self.adjacency_lists[start_node].update({end_node: edge})
-        self.adjacency_lists[end_node].update({start_node: edge})
+        replaced = self.insert_edge(edge)
+        self.index_edge(edge)
+        edge.mark_dirty()
+
+        # Remove any edge it replaced from the grid
+        if replaced is not None:
+            self.unindex_edge(replaced)
+            replaced.mark_dirty()
 
     def delete_edge(self, edge: Edge) -> None:
         """Removes edge from graph"""
-        # Loop through the adjacency list
-        for (node, a_list) in self.adjacency_lists.items():
-            # For each pair, if the edge is not the one being
-            # removed add it to the copt
-            l_copy = {}
-            for (k, v) in a_list.items():
-                if v != edge:
-                    l_copy.update({k: v})
-            
-            # Replace the list with the edge removed
-            self.adjacency_lists[node] = l_copy
-    
-    def delete_node(self, node: Node) -> None:
-        """Removes node from graph"""
-        # Iterate through adjacency list
-        copy = {}
-        for (k,v) in self.adjacency_lists.items():
-            # Check if node referenced is not node to be deleted
-            if k != node:
-                # Iterate through inner dictionary
-                adjacent = {}
-                for (a_node, edge) in v.items():
-                    # Check that node is not node to be deleted
-                    if a_node != node:
-                        adjacent.update({a_node: edge})
-                    else:
-                        # If it is node to be deleted, delete any connected edges
-                        self.delete_edge(edge)
-            
-                copy.update({k:adjacent})
-        
-        # Update adjacency list
-        self.adjacency_lists = copy
+        super().delete_edge(edge)
 
-        if self.clicked_node == node:
-            self.clicked_node = None
+        # Remove the edge from the grid
+        self.unindex_edge(edge)
+        edge.mark_dirty()
+
+    def delete_nodes(self, nodes) -> None:
+        """Removes many nodes from the graph at once"""
+        nodes = [node for node in nodes if node in self.adjacency_lists]
+
+        # Remove each node and connected edge from the grids
+        for node in nodes:
+            for edge in self.adjacency_lists[node].values():
+                self.unindex_edge(edge)
+                edge.mark_dirty()
+            self.node_grid.remove(node)
+            node.mark_dirty()
+
+            if self.clicked_node == node:
+                self.clicked_node = None
+
+        super().delete_nodes(nodes)
 
     def open_menu(self, item: Union[Node, Edge]) -> None:
         """Opens menu for graph element"""
@@ -280,20 +419,42 @@ class Graph:
         self.ENTRY.typing = True
         self.ENTRY.highlight()
 
-    def draw(self, mouse_pos: tuple[int, int], screen: pygame.Surface) -> None:
-        """Display graph to screen"""
-        # Draw all nodes and edges
-        for edge in self.edges:
-            edge.draw(screen)
+    def draw(self, mouse_pos: tuple[int, int], screen: pygame.Surface) -> list[pygame.Rect]:
+        """Display graph to screen, returns the areas changed since last drawn"""
+        if self.settings.cached_render:
+            # Bring the cached layer up to date and display it
+            rects = self.update_layer(screen.get_size())
+            screen.blit(self.layer, (0, 0))
+        else:
+            # Without the layer, changes are not tracked
+            rects = [screen.get_rect()]
+
+            # Draw all nodes and edges
+            for edge in self.edges:
+                edge.draw(screen)
+
+            for node in self.nodes:
+                node.draw(screen)
+
+            # Nothing is cached, so nothing needs redrawing later
+            self.settings.dirty_elements.clear()
+
+        # Update where the line to the mouse was
+        if self.drawn_line is not None:
+            rects.append(self.drawn_line)
+            self.drawn_line = None
 
         if self.clicked_node is not None:
-            pygame.draw.line(
+            self.drawn_line = pygame.draw.line(
                 screen, (0, 0, 0),
                 (self.clicked_node.x, self.clicked_node.y),
                 (mouse_pos[0], mouse_pos[1]), 10)
+            rects.append(self.drawn_line)
 
-        for node in self.nodes:
-            node.draw(screen)
+        # Update the menu area when it opens or closes
+        if bool(self.current_setting) != self.drawn_menu:
+            self.drawn_menu = bool(self.current_setting)
+            rects.append(pygame.Rect(self.S_X, 0, self.S_WIDTH, self.S_HEIGHT))
 
         # Check if setting are open
         if self.current_setting:
@@ -304,11 +465,86 @@ class Graph:
                 ])
 
             # Draw each of the elements of the settings
-            self.ENTRY.draw(screen)
-            self.CLOSE_BUTTON.draw(screen)
-            self.DELETE_BUTTON.draw(screen)
-            self.NAME_LABEL.draw(screen)
-            self.ENTRY_LABEL.draw(screen)
+            rects += self.ENTRY.draw(screen)
+            rects += self.CLOSE_BUTTON.draw(screen)
+            rects += self.DELETE_BUTTON.draw(screen)
+            rects += self.NAME_LABEL.draw(screen)
+            rects += self.ENTRY_LABEL.draw(screen)
+
+        return rects
+
+    def update_layer(self, size: tuple[int, int]) -> list[pygame.Rect]:
+        """Redraws the changed parts of the cached layer, returning the areas redrawn"""
+        dirty = self.settings.dirty_elements
+
+        # Draw everything again if the window has resized, the graph was replaced or the font changed
+        if self.drawn_font != self.settings.font:
+            self.drawn_font = self.settings.font
+            self.redraw_layer = True
+        if self.layer is None or self.layer.get_size() != size or self.redraw_layer:
+            self.layer = pygame.Surface(size, pygame.SRCALPHA)
+            self.layer_grid.clear()
+            self.drawn_rects = {}
+            self.draw_order = {}
+            self.draw_count = len(self.adjacency_lists) + len(self.edge_registry)
+            dirty.clear()
+            self.redraw_layer = False
+
+            for (i, element) in enumerate([*self.edges, *self.nodes]):
+                rect = element.get_rect()
+                self.drawn_rects[element] = rect
+                self.draw_order[element] = i
+                self.layer_grid.insert(element, self.layer_grid.rect_cells(rect))
+                element.draw(self.layer)
+
+            return [self.layer.get_rect()]
+
+        # Collect the area each changed element covered before and covers now
+        rects = []
+        for element in dirty:
+            if element in self.drawn_rects:
+                rects.append(self.drawn_rects.pop(element))
+                self.layer_grid.remove(element)
+
+            if element in self.adjacency_lists or element in self.edge_registry:
+                rect = element.get_rect()
+                self.drawn_rects[element] = rect
+                self.layer_grid.insert(element, self.layer_grid.rect_cells(rect))
+                rects.append(rect)
+
+                # New elements are drawn above the rest, as they are added last
+                if element not in self.draw_order:
+                    self.draw_order[element] = self.draw_count
+                    self.draw_count += 1
+            else:
+                # Deleted elements only need their old area clearing
+                self.draw_order.pop(element, None)
+        dirty.clear()
+
+        # Redraw one combined area instead of lots of small ones
+        if len(rects) > 32:
+            rects = [rects[0].unionall(rects[1:])]
+
+        # Clear each area and redraw everything overlapping it, with edges beneath nodes
+        for rect in rects:
+            self.layer.set_clip(rect)
+            self.layer.fill((0, 0, 0, 0))
+
+            # Redraw in the same order as the whole graph is drawn
+            overlapping = sorted([
+                element for element in self.layer_grid.query_rect(rect)
+                if self.drawn_rects[element].colliderect(rect)
+                ], key=lambda element: self.draw_order[element])
+            for element in overlapping:
+                if type(element) == Edge:
+                    element.draw(self.layer)
+            for element in overlapping:
+                if type(element) == Node:
+                    element.draw(self.layer)
+
+        self.layer.set_clip(None)
+
+        return rects
 
     def run_mouse(
         self, mouse_pos: tuple[int, int],
@@ -344,53 +580,72 @@ class Graph:
             if x > self.S_X and y < self.S_HEIGHT:
                 self.over_menu = True
         
+        # Only nodes in the grid cell under the mouse can be hovered, nodes
+        # hovered last frame are checked again so their names are hidden
+        candidates = dict.fromkeys(self.hovered_nodes + self.node_grid.query_point(mouse_pos))
+        self.hovered_nodes = [node for node in candidates if node.on_hover(mouse_pos) and node in self.adjacency_lists]
+
         # Check if any nodes clicked
-        if any([node.on_hover(mouse_pos) for node in self.nodes]):
+        if self.hovered_nodes != []:
             dragged = False
-            for node in self.nodes:
-                if node.on_hover(mouse_pos):
-                    if mouse_state[0] and self.settings.mouse_function is None:
-                        if self.settings.start_algorithm is not None:
-                            if self.settings.start_algorithm == "Dijkstras":
-                                if self.settings.start_node is None:
-                                    self.settings.start_node = node
-                                    self.settings.help_label.text = "Click node to select end node"
-                                    node.highlight()
-                                elif self.settings.start_node != node:
-                                    self.settings.cur_algorithm = Dijkstras(self.copy(), self.settings.start_node, node)
-                                    self.settings.start_algorithm = None
-                                    self.settings.start_node = None
-                                    self.settings.help_label.text = ""
-                            elif self.settings.start_algorithm == "Prims":
-                                self.settings.cur_algorithm = Prims(node, self.copy())
+            for node in self.hovered_nodes:
+                if mouse_state[0] and self.settings.mouse_function is None:
+                    if self.settings.start_algorithm is not None:
+                        if self.settings.start_algorithm in ["Dijkstras", "A*", "Bidirect"]:
+                            if self.settings.start_node is None:
+                                self.settings.start_node = node
+                                self.settings.help_label.text = "Click node to select end node"
+                                node.highlight()
+                            elif self.settings.start_node != node:
+                                algorithm = {
+                                    "Dijkstras": Dijkstras, "A*": AStar, "Bidirect": BidirectionalDijkstras
+                                    }[self.settings.start_algorithm]
+                                self.settings.cur_algorithm = algorithm(self.algorithm_copy(), self.settings.start_node, node)
                                 self.settings.start_algorithm = None
+                                self.settings.start_node = None
                                 self.settings.help_label.text = ""
-                                node.highlight()
-                        else:
-                            self.open_menu(node)
-                        self.settings.mouse_function = "Node"
-                    elif mouse_state[1]:
-                        if self.clicked_node is not None and self.clicked_node != node:
-                            self.add_edge(self.clicked_node, node)
-                            self.clicked_node = None
-                        else:
-                            self.clicked_node = node
-                    elif left_state and not dragged:
-                        node.x, node.y = mouse_pos
-                        dragged = True
-                        self.settings.mouse_function = "drag"
-
-        # Check if any edges clicked
-        elif any([edge.on_hover(mouse_pos) for edge in self.edges]):
-            for edge in self.edges:
-                if edge.on_hover(mouse_pos) and mouse_state[0] and self.settings.mouse_function is None:
+                        elif self.settings.start_algorithm == "Prims":
+                            self.settings.cur_algorithm = Prims(node, self.algorithm_copy())
+                            self.settings.start_algorithm = None
+                            self.settings.help_label.text = ""
+                            node.highlight()
+                    else:
+                        self.open_menu(node)
+                    self.settings.mouse_function = "Node"
+                elif mouse_state[1]:
+                    if self.clicked_node is not None and self.clicked_node != node:
+                        self.add_edge(self.clicked_node, node)
+                        self.clicked_node = None
+                    else:
+                        self.clicked_node = node
+                elif left_state and not dragged:
+                    self.move_node(node, mouse_pos)
+                    dragged = True
+                    self.settings.mouse_function = "drag"
+
+        else:
+            # Check the edges passing through the grid cell under the mouse
+            candidates = [*dict.fromkeys(self.hovered_edges + self.edge_grid.query_point(mouse_pos))]
+
+            if self.edge_hits is not None:
+                # Test every candidate at once, then show or hide weights to match
+                hovered = self.edge_hits.query(mouse_pos, candidates)
+                for edge in candidates:
+                    edge.show_weight = edge in hovered
+                self.hovered_edges = hovered
+            else:
+                self.hovered_edges = [edge for edge in candidates if edge.on_hover(mouse_pos) and edge in self.edge_registry]
+
+            # Check if any edges clicked
+            for edge in self.hovered_edges:
+                if mouse_state[0] and self.settings.mouse_function is None:
                     self.open_menu(edge)
                     self.settings.mouse_function = "Edge"
 
         if self.settings.mouse_function is None and not self.over_menu and mouse_state[0]:
             self.add_node(mouse_pos)
 
-        if mouse_state[1] and self.clicked_node is not None and not any([node.on_hover(mouse_pos) for node in self.nodes]):
+        if mouse_state[1] and self.clicked_node is not None and self.hovered_nodes == []:
             self.clicked_node = None
 
     def run_keys(self, pressed_keys: list[str]) -> None:
@@ -409,117 +664,83 @@ class Graph:
                 # Check type of current settings
                 if type(self.current_setting) == Node:
                     # Update node name corresponding
-                    self.current_setting.name = val
+                    if self.current_setting.name != val:
+                        self.current_setting.name = val
+                        self.current_setting.mark_dirty()
                 else:
                     # Check input is a number
-                    if val.isnumeric():
+                    if val.isnumeric() and self.current_setting.weight != int(val):
                         # Update edge weight corresponding
                         self.current_setting.weight = int(val)
+                        self.current_setting.mark_dirty()
         
 
     def copy(self):
-        """Returns a copy of the graph"""
-        # Create a new graph
-        g = Graph(self.settings)
-
-        # Make the adjacency list a copy of this instance's list
-        g.adjacency_lists = self.adjacency_lists.copy()
+        """Returns a copy of the graph, indexed so it can be drawn and edited"""
+        # Create a new graph holding the same nodes and edges
+        g = self.copy_into(Graph(self.settings))
+        g.rebuild_index()
 
         # Return the graph
         return g
 
-    @property
-    def nodes(self) -> list[Node]:
-        return [*self.adjacency_lists.keys()]
+    def algorithm_copy(self) -> BaseGraph:
+        """Returns a copy of the graph for an algorithm to run on, without the
+        grids and hit test table which are only needed for the mouse"""
+        return self.copy_into(BaseGraph())
+
+    def swap_in(self, other: "Graph") -> None:
+        """Replaces this graph's nodes and edges with those of a graph loaded elsewhere"""
+        # Take the other graph's adjacency list and grids, which are already built
+        self.adjacency_lists = other.adjacency_lists
+        self.edge_registry = other.edge_registry
+        self.node_grid = other.node_grid
+        self.edge_grid = other.edge_grid
+        self.edge_hits = other.edge_hits
+
+        # Forget anything pointing at the old nodes and edges
+        self.hovered_nodes = []
+        self.hovered_edges = []
+        self.current_setting = None
+        self.clicked_node = None
 
-    @property
-    def edges(self) -> list[Edge]:
-        # Get every edge
-        edges = []
-        for val in self.adjacency_lists.values():
-            if val != {}:
-                for (_, e) in val.items():
-                    edges.append(e)
+        # Stop any algorithm run on, or being set up on, the old nodes
+        if self.settings.cur_algorithm is not None:
+            self.settings.cur_algorithm.clear_up()
+            self.settings.cur_algorithm = None
+        self.settings.running = False
+        self.settings.start_algorithm = None
+        self.settings.start_node = None
+
+        # The cached layer needs redrawing for the new graph
+        self.redraw_layer = True
+
+    def graph_path(self, file_name: str) -> str:
+        """Returns the path of a saved graph, names ending in the binary extension use the binary format"""
+        if file_name.endswith(BINARY_EXTENSION):
+            return f"graphs/{file_name}"
 
-        # Return the edges
-        return [*set(edges)]    
+        return f"graphs/{file_name}.json"
+
+    def valid_name(self, file_name: str) -> bool:
+        """Returns whether a graph can be saved under the given name"""
+        return set("\/:*?\"<>|").intersection(set(file_name)) == set()
 
     def save_graph(self, file_name: str) -> None:
         """Function to save graphs"""
-        if set("\/:*?\"<>|").intersection(set(file_name)) is not None:
+        if not self.valid_name(file_name):
             return "Error"
-            
-        # Get the graph adjacency list
-        adjacency_list = self.adjacency_lists
-
-        # Give each node and edge a name
-        nodes = dict([(node, f"node{i}") for i, node in enumerate(self.nodes)])
-        edges = dict([(edge, f"edge{i}") for i, edge in enumerate(self.edges)])
-
-        # Translate the adjacency list using the above assigned names
-        stored_list = {}
-        for (key, adj_list) in adjacency_list.items():
-            new_adj_list = {}
-            for (key2, edge) in adj_list.items():
-                new_adj_list.update({nodes[key2]: edges[edge]})
-            stored_list.update({nodes[key]: new_adj_list})
-
-        # Encode the nodes, storing their name and positions
-        stored_nodes = {}
-        for (node, name) in nodes.items():
-            stored_nodes.update({name:{"name": node.name, "pos": [node.x, node.y]}})
-
-        # Encode the edges, storing their weight and start and end names
-        stored_edges = {}
-        for (edge, name) in edges.items():
-            stored_edges.update({name:{"weight": edge.weight, "start_node": nodes[edge.A], "end_node": nodes[edge.B]}})
-
-        # Create a dictionary storing all the information
-        file_content = {"info": {"adjacency_list": stored_list, "nodes": stored_nodes, "edges": stored_edges}}
-        
-        # Format the dictionary as a json format
-        to_write = json.dumps(file_content)
 
-        # Write the dictionary to a file
-        with open(f"graphs/{file_name}.json", "w") as f:
-            f.write(to_write)
+        self.save_file(self.graph_path(file_name))
 
     def load_graph(self, file_name: str) -> None:
         """Function to load a graph"""
         # Open the given file
-        if not os.path.exists(f"graphs//{file_name}.json"):
+        if not os.path.exists(self.graph_path(file_name)):
             return "Error"
-        
-        with open(f"graphs/{file_name}.json") as f:
-            content = f.read()
-
-        # Convert from json format to a dictionary
-        graph = json.loads(content)['info']
-
-        # Get all the nodes
-        nodes = graph['nodes']
-
-        # Create a new node for each node in the file
-        new_nodes = {}
-        for (name, info) in nodes.items():
-            new_nodes.update({name: Node(*info['pos'], info['name'], self.settings)})
-
-        # Get all the edges
-        edges = graph['edges']
-
-        # Create a new edge for each edge in the file
-        new_edges = {}
-        for (name, info) in edges.items():
-            new_edges.update({name: Edge(new_nodes[info['start_node']], new_nodes[info['end_node']], info['weight'], self.settings)})
-
-        # Translate the string version of the adjacency list to hold classes
-        old_adj_list = graph['adjacency_list']
-        translated_list = {}
-        for (node, adj_list) in old_adj_list.items():
-            inner_list = {}
-            for (c_node, edge) in adj_list.items():
-                inner_list.update({new_nodes[c_node]:new_edges[edge]})
-            translated_list.update({new_nodes[node]:inner_list})
-
-        # Swap out the graph adjacency list
-        self.adjacency_lists = translated_list
\ No newline at end of file
+
+        self.load_file(self.graph_path(file_name))
+
+        # The grids and cached layer need rebuilding for the new graph
+        self.rebuild_index()
+        self.redraw_layer = True
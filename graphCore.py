@@ -0,0 +1,517 @@
+from __future__ import annotations
+
+# Import base libraries
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from typing import Callable, Union, KeysView
+
+# Extension of graph files saved in the binary format
+BINARY_EXTENSION = ".bgraph"
+
+# Binary file header, holding the format marker, version, node count, edge count and string heap size
+BINARY_MAGIC = b"GRPH"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sIQQQ")
+
+# Number of rows loaded between each progress report
+PROGRESS_ROWS = 4096
+
+# Base node class
+class BaseNode:
+    """Node holding only the data algorithms need, without any drawing"""
+    def __init__(self, x: Union[int, float], y: Union[int, float], name: str) -> None:
+        """Initialisation function of base node class"""
+        # Check that arguments are of correct type
+        if type(x) not in (int, float) or type(y) not in (int, float):
+            raise BaseException("Entered wrong type")
+        if type(name) not in [str, int, float]:
+            raise BaseException("Entered wrong type for name")
+
+        # Create instance variables
+        self.x = x
+        self.y = y
+        self.name = str(name)
+
+    def highlight(self) -> None:
+        """Function to highlight the node, does nothing without a display"""
+
+    def unhighlight(self) -> None:
+        """Function to unhighlight the node, does nothing without a display"""
+
+# Base edge class
+class BaseEdge:
+    """Edge holding only the data algorithms need, without any drawing"""
+    def __init__(self, start_node: BaseNode, end_node: BaseNode, weight: int) -> None:
+        """Initialisation function of base edge class"""
+        if type(weight) != int:
+            raise BaseException("Entered wrong type for weight")
+        if not (isinstance(start_node, BaseNode) and isinstance(end_node, BaseNode)):
+            raise BaseException("Entered wrong type for nodes")
+
+        # Create instance variables
+        self.A = start_node
+        self.B = end_node
+        self.weight = weight
+
+    def highlight(self) -> None:
+        """Function to highlight the edge, does nothing without a display"""
+
+    def unhighlight(self) -> None:
+        """Function to unhighlight the edge, does nothing without a display"""
+
+# Base graph class
+class BaseGraph:
+    """Graph structure used by the algorithms, which can be loaded without pygame"""
+    def __init__(self) -> None:
+        """Initialisation function of base graph class"""
+        # Create instance variables
+        self.adjacency_lists: dict[BaseNode, dict[BaseNode, BaseEdge]] = {}
+        self.edge_registry: dict[BaseEdge, None] = {}
+
+    def new_node(self, x: Union[int, float], y: Union[int, float], name: str) -> BaseNode:
+        """Creates a node of the type held by the graph"""
+        return BaseNode(x, y, name)
+
+    def new_edge(self, start_node: BaseNode, end_node: BaseNode, weight: int) -> BaseEdge:
+        """Creates an edge of the type held by the graph"""
+        return BaseEdge(start_node, end_node, weight)
+
+    def insert_node(self, node: BaseNode) -> None:
+        """Adds a node to the graph"""
+        self.adjacency_lists.update({node: {}})
+
+    def insert_edge(self, edge: BaseEdge) -> Union[BaseEdge, None]:
+        """Adds an edge to the graph, returning any edge it replaced"""
+        # Remove any edge already joining the nodes, as it is replaced
+        replaced = self.adjacency_lists[edge.A].get(edge.B)
+        if replaced is not None:
+            self.edge_registry.pop(replaced, None)
+
+        # Update adjacency list for both start and end node
+        self.adjacency_lists[edge.A].update({edge.B: edge})
+        self.adjacency_lists[edge.B].update({edge.A: edge})
+        self.edge_registry[edge] = None
+
+        return replaced
+
+    def delete_edge(self, edge: BaseEdge) -> None:
+        """Removes edge from graph"""
+        # Only the adjacency lists of the two end nodes hold the edge,
+        # check it is still the one stored in case it was replaced
+        if self.adjacency_lists.get(edge.A, {}).get(edge.B) == edge:
+            del self.adjacency_lists[edge.A][edge.B]
+            del self.adjacency_lists[edge.B][edge.A]
+
+        # Remove the edge from the registry
+        self.edge_registry.pop(edge, None)
+
+    def delete_node(self, node: BaseNode) -> None:
+        """Removes node from graph"""
+        self.delete_nodes([node])
+
+    def delete_nodes(self, nodes) -> None:
+        """Removes many nodes from the graph at once"""
+        # Take a list first, as the nodes may be a view of this graph's own nodes
+        for node in [*nodes]:
+            # Skip nodes that are not in the graph
+            if node not in self.adjacency_lists:
+                continue
+
+            # Remove each connected edge from the adjacent node and registry
+            for (a_node, edge) in self.adjacency_lists.pop(node).items():
+                if a_node != node:
+                    del self.adjacency_lists[a_node][node]
+                self.edge_registry.pop(edge, None)
+
+    def copy_into(self, g: BaseGraph) -> BaseGraph:
+        """Makes the given empty graph a copy of this graph"""
+        # Make the adjacency list a copy of this instance's list, the inner
+        # lists are copied as deletions change them in place
+        g.adjacency_lists = dict([(node, a_list.copy()) for (node, a_list) in self.adjacency_lists.items()])
+        g.edge_registry = self.edge_registry.copy()
+
+        return g
+
+    def copy(self) -> BaseGraph:
+        """Returns a copy of the graph"""
+        return self.copy_into(BaseGraph())
+
+    # The nodes and edges are live views rather than copies, so take a list
+    # of them, e.g. [*graph.edges], before adding or removing while looping
+    @property
+    def nodes(self) -> KeysView[BaseNode]:
+        return self.adjacency_lists.keys()
+
+    @property
+    def edges(self) -> KeysView[BaseEdge]:
+        # The registry is kept up to date as edges are added and removed
+        return self.edge_registry.keys()
+
+    def save_file(self, path: str) -> None:
+        """Function to save the graph to a file, in the format given by its extension"""
+        if path.endswith(BINARY_EXTENSION):
+            self.save_binary(path)
+        else:
+            self.save_json(path)
+
+    def load_file(self, path: str, progress: Union[Callable[[float], None], None] = None) -> None:
+        """Function to load the graph from a file, in the format given by its extension,
+        progress is called with the fraction of the file read so far"""
+        if path.endswith(BINARY_EXTENSION):
+            self.load_binary(path, progress)
+        else:
+            self.load_json(path, progress)
+
+    def save_binary(self, path: str) -> None:
+        """Function to save the graph in the compact binary format"""
+        # Number each node, and store the names one after another
+        nodes = [*self.nodes]
+        numbers = dict([(node, i) for (i, node) in enumerate(nodes)])
+        names = [node.name.encode() for node in nodes]
+        offsets = array("I", [0])
+        for name in names:
+            offsets.append(offsets[-1] + len(name))
+
+        # Build each column of the node and edge tables
+        edges = [*self.edges]
+        columns = [
+            array("d", [node.x for node in nodes]),
+            array("d", [node.y for node in nodes]),
+            array("q", [edge.weight for edge in edges]),
+            offsets,
+            array("I", [numbers[edge.A] for edge in edges]),
+            array("I", [numbers[edge.B] for edge in edges])
+            ]
+
+        with open(path, "wb") as f:
+            f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(nodes), len(edges), offsets[-1]))
+
+            # The file is always little endian
+            for column in columns:
+                if sys.byteorder == "big":
+                    column.byteswap()
+                column.tofile(f)
+
+            f.write(b"".join(names))
+
+    def load_binary(self, path: str, progress: Union[Callable[[float], None], None] = None) -> None:
+        """Function to load the graph from the compact binary format"""
+        with BinaryGraph(path) as tables:
+            rows = max(tables.node_count + tables.edge_count, 1)
+
+            # Read whole columns at once, which is much faster than one item at a time
+            xs, ys, names = tables.xs.tolist(), tables.ys.tolist(), tables.names()
+            starts, ends, weights = tables.starts.tolist(), tables.ends.tolist(), tables.weights.tolist()
+
+        # Create a new node for each row of the node table, a block of rows at a time
+        new_nodes = []
+        new_node = self.new_node
+        for i in range(0, len(xs), PROGRESS_ROWS):
+            if progress is not None:
+                progress(i / rows)
+
+            # Positions are stored as floats, but are usually whole numbers
+            new_nodes += [
+                new_node(int(x) if x.is_integer() else x, int(y) if y.is_integer() else y, name)
+                for (x, y, name) in zip(xs[i:i+PROGRESS_ROWS], ys[i:i+PROGRESS_ROWS], names[i:i+PROGRESS_ROWS])
+                ]
+
+        adjacency_lists = dict([(node, {}) for node in new_nodes])
+        edge_registry = {}
+
+        # Create a new edge for each row of the edge table
+        new_edge = self.new_edge
+        for i in range(0, len(starts), PROGRESS_ROWS):
+            if progress is not None:
+                progress((len(xs) + i) / rows)
+
+            for (a, b, weight) in zip(starts[i:i+PROGRESS_ROWS], ends[i:i+PROGRESS_ROWS], weights[i:i+PROGRESS_ROWS]):
+                start_node, end_node = new_nodes[a], new_nodes[b]
+                edge = new_edge(start_node, end_node, weight)
+                adjacency_lists[start_node][end_node] = edge
+                adjacency_lists[end_node][start_node] = edge
+                edge_registry[edge] = None
+
+        # Swap out the graph adjacency list and edge registry
+        self.adjacency_lists = adjacency_lists
+        self.edge_registry = edge_registry
+
+    def save_json(self, path: str) -> None:
+        """Function to save the graph in the json format"""
+        # Get the graph adjacency list
+        adjacency_list = self.adjacency_lists
+
+        # Give each node and edge a name
+        nodes = dict([(node, f"node{i}") for i, node in enumerate(self.nodes)])
+        edges = dict([(edge, f"edge{i}") for i, edge in enumerate(self.edges)])
+
+        # Translate the adjacency list using the above assigned names
+        stored_list = {}
+        for (key, adj_list) in adjacency_list.items():
+            new_adj_list = {}
+            for (key2, edge) in adj_list.items():
+                new_adj_list.update({nodes[key2]: edges[edge]})
+            stored_list.update({nodes[key]: new_adj_list})
+
+        # Encode the nodes, storing their name and positions
+        stored_nodes = {}
+        for (node, name) in nodes.items():
+            stored_nodes.update({name:{"name": node.name, "pos": [node.x, node.y]}})
+
+        # Encode the edges, storing their weight and start and end names
+        stored_edges = {}
+        for (edge, name) in edges.items():
+            stored_edges.update({name:{"weight": edge.weight, "start_node": nodes[edge.A], "end_node": nodes[edge.B]}})
+
+        # Create a dictionary storing all the information
+        file_content = {"info": {"adjacency_list": stored_list, "nodes": stored_nodes, "edges": stored_edges}}
+
+        # Format the dictionary as a json format
+        to_write = json.dumps(file_content)
+
+        # Write the dictionary to a file
+        with open(path, "w") as f:
+            f.write(to_write)
+
+    def load_json(self, path: str, progress: Union[Callable[[float], None], None] = None) -> None:
+        """Function to load the graph from the json format, reading it a piece at a time"""
+        # Keep the current graph in case the file cannot be read
+        old_graph = (self.adjacency_lists, self.edge_registry)
+        self.adjacency_lists, self.edge_registry = {}, {}
+
+        try:
+            with open(path) as f:
+                # Report progress as each piece of the file is read
+                on_fill = None
+                if progress is not None:
+                    # The size is in bytes, which can be more than the characters
+                    # read, so count the bytes taken from the file underneath
+                    size = max(os.path.getsize(path), 1)
+                    on_fill = lambda: progress(min(f.buffer.tell() / size, 1))
+
+                stream = JsonStream(f, on_fill=on_fill)
+
+                # Nodes by the names used in the file, and edges seen before their nodes
+                new_nodes: dict[str, BaseNode] = {}
+                waiting_edges = []
+
+                for key in stream.object_keys():
+                    if key != "info":
+                        stream.skip_value()
+                        continue
+
+                    for section in stream.object_keys():
+                        if section == "nodes":
+                            # Create a new node for each node in the file
+                            for name in stream.object_keys():
+                                info = stream.read_value()
+                                new_nodes[name] = self.new_node(*info['pos'], info['name'])
+                                self.insert_node(new_nodes[name])
+                        elif section == "edges":
+                            # Create a new edge for each edge in the file
+                            for name in stream.object_keys():
+                                info = stream.read_value()
+                                if info['start_node'] in new_nodes and info['end_node'] in new_nodes:
+                                    self.insert_edge(self.new_edge(new_nodes[info['start_node']], new_nodes[info['end_node']], info['weight']))
+                                else:
+                                    waiting_edges.append(info)
+                        else:
+                            # The adjacency list is made from the edges, so is skipped
+                            stream.skip_value()
+
+                # Add any edges which came before their nodes
+                for info in waiting_edges:
+                    self.insert_edge(self.new_edge(new_nodes[info['start_node']], new_nodes[info['end_node']], info['weight']))
+        except:
+            self.adjacency_lists, self.edge_registry = old_graph
+            raise
+
+# Binary graph class
+class BinaryGraph:
+    """Node and edge tables of a binary graph file, read through a memory map"""
+    def __init__(self, path: str) -> None:
+        """Initialisation function of the binary graph class"""
+        # Map the file into memory, so only the parts used are read
+        self.file = open(path, "rb")
+
+        # Close the file again if it cannot be read
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self.map)
+
+            # Read the header
+            if len(self.view) < BINARY_HEADER.size:
+                raise ValueError("Not a binary graph file")
+            magic, version, self.node_count, self.edge_count, heap_size = BINARY_HEADER.unpack_from(self.map, 0)
+            if magic != BINARY_MAGIC or version != BINARY_VERSION:
+                raise ValueError("Not a binary graph file")
+
+            # Each column follows the last, the 8 byte columns first to keep them aligned
+            self.pos = BINARY_HEADER.size
+            self.xs = self.column("d", self.node_count)
+            self.ys = self.column("d", self.node_count)
+            self.weights = self.column("q", self.edge_count)
+            self.offsets = self.column("I", self.node_count + 1)
+            self.starts = self.column("I", self.edge_count)
+            self.ends = self.column("I", self.edge_count)
+            self.heap = self.column("B", heap_size)
+        except BaseException:
+            self.close()
+            raise
+
+    def column(self, code: str, length: int):
+        """Returns the next column of the file as an array of the given type"""
+        size = array(code).itemsize * length
+        if self.pos + size > len(self.view):
+            raise ValueError("Binary graph file is cut short")
+
+        column = self.view[self.pos:self.pos + size].cast(code)
+        self.pos += size
+
+        # Columns can be used in place, unless the file's byte order must be swapped
+        if sys.byteorder == "big":
+            column = array(code, column)
+            column.byteswap()
+
+        return column
+
+    def names(self) -> list[str]:
+        """Returns the name of every node, decoding the string heap at once"""
+        offsets = self.offsets.tolist()
+        heap = bytes(self.heap)
+        text = heap.decode()
+
+        # When every character is one byte the byte offsets can cut up the text
+        if len(text) == len(heap):
+            return [text[a:b] for (a, b) in zip(offsets, offsets[1:])]
+
+        return [heap[a:b].decode() for (a, b) in zip(offsets, offsets[1:])]
+
+    def close(self) -> None:
+        """Releases the memory map and closes the file, including after a failed open"""
+        for name in ["xs", "ys", "weights", "offsets", "starts", "ends", "heap", "view"]:
+            if isinstance(getattr(self, name, None), memoryview):
+                getattr(self, name).release()
+        if hasattr(self, "map"):
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self) -> BinaryGraph:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+# Json stream class
+class JsonStream:
+    """Reads a json file a piece at a time, so large files do not need reading whole"""
+    def __init__(self, f, chunk_size: int = 1 << 16, on_fill: Union[Callable[[], None], None] = None) -> None:
+        """Initialisation function of the json stream class"""
+        # Create instance variables
+        self.file = f
+        self.chunk_size = chunk_size
+        self.on_fill = on_fill
+        self.buffer = ""
+        self.pos = 0
+        self.finished = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self) -> bool:
+        """Reads the next piece of the file, returns False at the end of the file"""
+        chunk = self.file.read(self.chunk_size)
+        if chunk == "":
+            self.finished = True
+            return False
+
+        # Drop the part of the buffer that has already been read
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+        # Report that more of the file has been read
+        if self.on_fill is not None:
+            self.on_fill()
+
+        return True
+
+    def peek(self) -> str:
+        """Returns the next character that is not whitespace, without reading it"""
+        while True:
+            self.pos = JSON_WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of file")
+
+    def expect(self, char: str) -> None:
+        """Reads the next character, which must be the one given"""
+        if self.peek() != char:
+            raise ValueError(f"Expected {char} at {self.buffer[self.pos:self.pos+20]!r}")
+        self.pos += 1
+
+    def read_value(self):
+        """Reads and returns the next value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+
+                # A number at the end of the buffer may continue in the next piece
+                if end < len(self.buffer) or self.finished:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.finished:
+                    raise
+
+            # Read more of the file and try again
+            self.fill()
+
+    def skip_value(self) -> None:
+        """Reads past the next value without building it"""
+        if self.peek() not in "{[":
+            self.read_value()
+            return
+
+        depth = 0
+        while True:
+            # Jump over everything up to the next bracket outside of a string
+            self.pos = JSON_SKIP.match(self.buffer, self.pos).end()
+
+            # Read more if the buffer ends, or a string is split across pieces
+            if self.pos == len(self.buffer) or self.buffer[self.pos] == '"':
+                if not self.fill():
+                    raise ValueError("Unexpected end of file")
+                continue
+
+            # Step into or out of an object or list
+            depth += 1 if self.buffer[self.pos] in "{[" else -1
+            self.pos += 1
+            if depth == 0:
+                return
+
+    def object_keys(self):
+        """Reads through an object, yielding each key, the value must be read before the next key"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+
+            # Move on to the next key or the end of the object
+            if self.peek() == "}":
+                self.pos += 1
+                return
+            self.expect(",")
+
+# Patterns used to skip over whitespace and values
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+JSON_SKIP = re.compile(r'(?:[^"{}\[\]]+|"(?:[^"\\]|\\.)*")*')
@@ -6,12 +6,15 @@ from typing import Union
 
 # Custom scripts
 from colour import Colour
+from fontCache import font_registry, text_cache
+from spatialGrid import SpatialGrid
 from typing import Union, TYPE_CHECKING
 
 # Block off for type checking so cyclic import does not occur
 if TYPE_CHECKING:
     # Import custom scripts
     from settings import Settings
+    from algorithms import Box, Dijkstras
 
 # Initialise pygame font library for use later
 pygame.font.init()
@@ -19,6 +22,22 @@ pygame.font.init()
 # List of allowed characters to type
 allowed_chars = "!\"$%^&*()_+-=qwertyuiopasdfghjklzxcvbnmQWERTYUIOPASDFGHJKLZXCVBNM,.<>[]{};';@#~/?1234567890"
 
+def changed_areas(element, state: tuple, rect: pygame.Rect) -> list[pygame.Rect]:
+    """Returns the areas of the window to update if an element has changed since last drawn"""
+    # Nothing to update if the element looks the same in the same place
+    if state == element.drawn_state and rect == element.drawn_rect:
+        return []
+
+    # Update both where the element was and where it is now
+    rects = [rect]
+    if element.drawn_rect is not None:
+        rects.append(element.drawn_rect)
+
+    element.drawn_state = state
+    element.drawn_rect = rect
+
+    return rects
+
 # Button class
 class Button:
     """Class to handle the creation of buttons"""
@@ -46,29 +65,38 @@ class Button:
         self.colour = Colour(0, 0, 1)
         self.border_colour = Colour(0, 0, 0)
         self.hovered = False
+        self.drawn_state = None
+        self.drawn_rect = None
 
-        # Instance constants
-        self.FONT = pygame.font.SysFont(self.settings.font, 10)
-        self.TEXT = self.FONT.render(str(self.label), True, (0, 0, 0))
-        if self.tooltip is not None:
-            self.TOOLTIP_TEXT = self.FONT.render(self.tooltip, True, (0, 0, 0), (255, 255, 255))
+        # Size of the label text, the font itself is looked up when drawn
+        self.font_size = 10
 
-    def draw(self, screen: pygame.Surface) -> None:
-        """Function to draw the button"""
+    @property
+    def font(self) -> pygame.font.Font:
+        """Font the label is drawn in, looked up each time so a change of font is used"""
+        return font_registry.get(self.settings.font, self.font_size)
+
+    def draw(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        """Function to draw the button, returns the areas changed since last drawn"""
 
         # Draw a white rectangle for the button background
         pygame.draw.rect(screen, self.colour.rgb, ((self.x + 2, self.y + 2, self.width - 4, self.height - 4)))
         
         # Display the text in the centre of the button
-        screen.blit(self.TEXT, (self.x + (self.width - self.TEXT.get_width()) / 2, self.y + (self.height - self.TEXT.get_height()) / 2))
+        text = text_cache.render(self.font, str(self.label), (0, 0, 0))
+        screen.blit(text, (self.x + (self.width - text.get_width()) / 2, self.y + (self.height - text.get_height()) / 2))
 
         # Draw a hollow black rectangle with border 5
         pygame.draw.rect(screen, self.border_colour.rgb, (self.x, self.y, self.width, self.height), 5)
 
+        rect = pygame.Rect(self.x, self.y, self.width, self.height)
+
         if self.hovered:
             if self.tooltip is not None:
-                screen.blit(self.TOOLTIP_TEXT, (self.x, self.y - self.TOOLTIP_TEXT.get_height() - 2))
+                tooltip = text_cache.render(self.font, self.tooltip, (0, 0, 0), (255, 255, 255))
+                rect.union_ip(screen.blit(tooltip, (self.x, self.y - tooltip.get_height() - 2)))
 
+        return changed_areas(self, (self.colour.rgb, self.hovered, self.settings.font), rect)
 
     def on_hover(self, mouse_pos: tuple[int, int]) -> bool:
         """Function to detect hover"""
@@ -119,17 +147,17 @@ class Entry(Button):
         self.typing = False
         self.settings = settings
 
-        self.FONT = pygame.font.SysFont(self.settings.font, font_size)
+        self.font_size = font_size
 
-    def draw(self, screen: pygame.Surface) -> None:
-        """Function to draw entry box"""
+    def draw(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        """Function to draw entry box, returns the areas changed since last drawn"""
 
         # Rerender text
-        self.text = self.FONT.render(self.label, True, (0, 0, 0))
+        self.text = text_cache.render(self.font, self.label, (0, 0, 0))
 
         while self.text.get_width() > self.width - 10:
             self.label = self.label[:-1]
-            self.text = self.FONT.render(self.label, True, (0, 0, 0))
+            self.text = text_cache.render(self.font, self.label, (0, 0, 0))
 
         # Draw a white rectangle for the button background
         pygame.draw.rect(screen, self.colour.rgb, ((self.x + 2, self.y + 2, self.width - 4, self.height - 4)))
@@ -140,6 +168,8 @@ class Entry(Button):
         # Draw a hollow black rectangle with border 5
         pygame.draw.rect(screen, self.border_colour.rgb, (self.x, self.y, self.width, self.height), 5)
 
+        return changed_areas(self, (self.label, self.colour.rgb, self.settings.font), pygame.Rect(self.x, self.y, self.width, self.height))
+
     def on_click(self, mouse_pos: tuple[int, int], mouse_state: tuple[bool, bool, bool]) -> bool:
         """Function to check whether click and run functions if happening"""
 
@@ -199,17 +229,23 @@ class Label:
         self.size = size
         self.text_colour = Colour(0, 0, 0)
         self.settings = settings
+        self.drawn_state = None
+        self.drawn_rect = None
 
-        # Create instance constants
-        self.FONT = pygame.font.SysFont(self.settings.font, size)
+    @property
+    def font(self) -> pygame.font.Font:
+        """Font the label is drawn in, looked up each time so a change of font is used"""
+        return font_registry.get(self.settings.font, self.size)
 
-    def draw(self, screen: pygame.Surface) -> None:
-        """Function to draw the label"""
+    def draw(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        """Function to draw the label, returns the areas changed since last drawn"""
         # Re-render the text in case it has changed
-        self.render = self.FONT.render(self._text, True, self.text_colour.rgb)
+        self.render = text_cache.render(self.font, self._text, self.text_colour.rgb)
 
         # Blit the text to the screen
-        screen.blit(self.render, (self.x, self.y))
+        rect = screen.blit(self.render, (self.x, self.y))
+
+        return changed_areas(self, (self._text, self.text_colour.rgb, self.settings.font), rect)
 
     @property
     def text(self) -> str:
@@ -218,3 +254,170 @@ class Label:
     @text.setter
     def text(self, text: Union[str, int, float]) -> None:
         self._text = str(text)
+
+# Box view class
+class BoxView:
+    """Draws a box from dijkstra's algorithm above its node"""
+    def __init__(self, box: Box) -> None:
+        """Initialisation function for the box view class"""
+        # Create instance variables
+        self.box = box
+
+        # Create instance constants
+        self.FONT = font_registry.get("Helvetica", 10)
+        self.PADDING = 4
+
+    def render(self) -> tuple[pygame.Surface, pygame.Surface, pygame.Surface]:
+        """Renders the left value, right value and notes of the box"""
+        return (
+            text_cache.render(self.FONT, str(self.box.left), (0, 0, 0), (255, 255, 255)),
+            text_cache.render(self.FONT, str(self.box.right), (0, 0, 0), (255, 255, 255)),
+            text_cache.render(self.FONT, ", ".join([str(w) for w in self.box.notes]), (0, 0, 0), (255, 255, 255))
+            )
+
+    def get_rect(self) -> pygame.Rect:
+        """Returns the area the box covers when drawn"""
+        top_left, top_right, notes = self.render()
+        box_width = max(notes.get_width(), top_left.get_width()+top_right.get_width()) + self.PADDING*3
+        box_height = top_left.get_height() + notes.get_height() + self.PADDING*3
+
+        return pygame.Rect(
+            self.box.node.x - box_width//2, self.box.node.y - self.box.node.RADIUS - 2 - box_height,
+            box_width, box_height).inflate(self.PADDING, self.PADDING)
+
+    def draw(self, screen: pygame.Surface, offset: tuple[int, int] = (0, 0)) -> None:
+        """Function to draw the box to the screen, moved back by the offset"""
+        # Get x and y of paired node
+        x, y = self.box.node.x - offset[0], self.box.node.y - offset[1]
+
+        # Render each piece of text
+        top_left, top_right, notes = self.render()
+
+        # Work out box width and height
+        box_width = max(notes.get_width(), top_left.get_width()+top_right.get_width()) + self.PADDING*3
+        box_height = top_left.get_height() + notes.get_height() + self.PADDING*3
+
+        # Work out the position of the top left of the box
+        top_x = x - box_width//2
+        top_y = y - self.box.node.RADIUS - 2 - box_height
+
+        # Draw the containing box for the text, filled rather than outlined
+        # as outlines are drawn differently when only part of the layer is redrawn
+        pygame.draw.rect(screen, (0, 0, 0), (top_x, top_y, box_width, box_height))
+        pygame.draw.rect(screen, (255, 255, 255), (
+            top_x+self.PADDING, top_y+self.PADDING,
+            box_width-self.PADDING*2, box_height-self.PADDING*2))
+
+        # Display the text
+        screen.blit(top_left, (top_x+self.PADDING, top_y + self.PADDING))
+        screen.blit(top_right, (top_x+top_left.get_width()+self.PADDING*2, top_y + self.PADDING))
+        screen.blit(notes, (top_x+self.PADDING, top_y+top_left.get_height()+self.PADDING*2))
+
+        # Draw the inner lines in the box, as rectangles for the same reason
+        pygame.draw.rect(screen, (0, 0, 0), (
+            x-self.PADDING+1, top_y, self.PADDING, box_height//2+1))
+        pygame.draw.rect(screen, (0, 0, 0), (
+            top_x, top_y+box_height//2-self.PADDING//2+1, box_width+1, self.PADDING))
+
+# Box layer class
+class BoxLayer:
+    """Keeps the boxes of dijkstra's algorithm on a cached off-screen layer,
+    redrawing only the boxes that have changed"""
+    def __init__(self, algorithm: Dijkstras) -> None:
+        """Initialisation function for the box layer class"""
+        # Create instance variables, boxes are drawn in the order of their nodes
+        self.algorithm = algorithm
+        self.views = dict([(node, BoxView(box)) for (node, box) in algorithm.boxes.items()])
+        self.draw_order = dict([(node, i) for (i, node) in enumerate(self.views)])
+
+        # Off-screen layer holding the drawn boxes, with the area each box covers
+        self.layer: Union[pygame.Surface, None] = None
+        self.layer_grid = SpatialGrid()
+        self.drawn_rects: dict = {}
+
+        # Boxes not yet reached all look the same, so one is drawn and copied for
+        # the rest, with where it goes compared with its node
+        self.blank: Union[pygame.Surface, None] = None
+        self.blank_offset = (0, 0)
+
+    def draw(self, screen: pygame.Surface, moved: dict) -> list[pygame.Rect]:
+        """Displays the boxes to the screen, redrawing the boxes changed by the algorithm
+        or whose nodes are in moved, returns the areas changed since last drawn"""
+        rects = self.update_layer(screen.get_size(), moved)
+        screen.blit(self.layer, (0, 0))
+
+        return rects
+
+    def update_layer(self, size: tuple[int, int], moved: dict) -> list[pygame.Rect]:
+        """Redraws the changed boxes on the cached layer, returning the areas redrawn"""
+        changed = self.algorithm.changed_boxes
+
+        # Draw every box again if the window has resized
+        if self.layer is None or self.layer.get_size() != size:
+            self.layer = pygame.Surface(size, pygame.SRCALPHA)
+            self.layer_grid.clear()
+            self.drawn_rects = {}
+            changed.clear()
+
+            for node in self.views:
+                self.drawn_rects[node] = self.box_rect(node)
+                self.layer_grid.insert(node, self.layer_grid.rect_cells(self.drawn_rects[node]))
+                self.draw_box(node)
+
+            return [self.layer.get_rect()]
+
+        # Collect the area each changed box covered before and covers now,
+        # boxes move with their nodes so moved nodes count as changed
+        rects = []
+        for node in [*changed, *[node for node in moved if node in self.views]]:
+            rects.append(self.drawn_rects[node])
+            self.drawn_rects[node] = self.box_rect(node)
+            self.layer_grid.insert(node, self.layer_grid.rect_cells(self.drawn_rects[node]))
+            rects.append(self.drawn_rects[node])
+        changed.clear()
+
+        # Redraw one combined area instead of lots of small ones
+        if len(rects) > 32:
+            rects = [rects[0].unionall(rects[1:])]
+
+        # Clear each area and redraw every box overlapping it
+        for rect in rects:
+            self.layer.set_clip(rect)
+            self.layer.fill((0, 0, 0, 0))
+
+            overlapping = sorted([
+                node for node in self.layer_grid.query_rect(rect)
+                if self.drawn_rects[node].colliderect(rect)
+                ], key=lambda node: self.draw_order[node])
+            for node in overlapping:
+                self.draw_box(node)
+
+        self.layer.set_clip(None)
+
+        return rects
+
+    def is_blank(self, node) -> bool:
+        """Returns whether a node's box has nothing written in it"""
+        box = self.views[node].box
+        return box.left == " " and box.right == " " and box.notes == []
+
+    def box_rect(self, node) -> pygame.Rect:
+        """Returns the area a node's box covers"""
+        if not self.is_blank(node):
+            return self.views[node].get_rect()
+
+        # Draw the first blank box found, to copy for the rest
+        if self.blank is None:
+            rect = self.views[node].get_rect()
+            self.blank = pygame.Surface(rect.size, pygame.SRCALPHA)
+            self.views[node].draw(self.blank, rect.topleft)
+            self.blank_offset = (rect.x - node.x, rect.y - node.y)
+
+        return self.blank.get_rect(topleft=(node.x + self.blank_offset[0], node.y + self.blank_offset[1]))
+
+    def draw_box(self, node) -> None:
+        """Draws a node's box to the layer"""
+        if self.is_blank(node) and self.blank is not None:
+            self.layer.blit(self.blank, self.drawn_rects[node])
+        else:
+            self.views[node].draw(self.layer)
@@ -1,22 +1,30 @@
 # Import base libraries
 import pygame
+import time
+from typing import Union
 
 # Import custom scripts
-from guiElements import Label, Button, Entry
+from guiElements import Label, Button, Entry, BoxLayer
+from fileWorker import FileWorker
+from profiler import profiler
 from graph import Graph
 from settings import Settings
-from algorithms import Kruskals, Dijkstras
+from algorithms import Kruskals, Dijkstras, AStar, BidirectionalDijkstras
 
 class Interface:
     """Class to handle the interface of the program"""
     def __init__(self, settings: Settings) -> None:
         """Initialisation function of the interface class"""
         self.buttons: list[Button] = [
+            Button(10, 440, 40, 20, "A*", settings, "Shortest path algorithm guided towards the end"),
+            Button(60, 440, 40, 20, "Bidirect", settings, "Shortest path algorithm searching from both ends"),
             Button(10, 470, 40, 20, "Dijkstras", settings, "Shortest path algorithm"),
             Button(60, 470, 40, 20, "Prims", settings, "Minimum spanning tree algorithm"),
             Button(110, 470, 40, 20, "Kruskals", settings, "Minimum spanning tree algorithm"),
             Button(160, 470, 40, 20, "Next", settings, "Runs next step in algorithm"),
             Button(210, 470, 40, 20, "Prev", settings, "Steps back through the algorithm"),
+            Button(260, 470, 40, 20, "Run", settings, "Starts or stops running the algorithm"),
+            Button(310, 470, 40, 20, "Finish", settings, "Runs the algorithm to the end"),
             Button(540, 440, 50, 20, "Save Graph", settings, "Saves graph to file"),
             Button(540, 470, 50, 20, "Load Graph", settings, "Loads graph from file")
         ]
@@ -29,19 +37,55 @@ class Interface:
 
         self.help_label: Label = self.settings.help_label
 
-    def draw(self, screen: pygame.Surface) -> None:
-        """Displays the interface to the screen"""
+        # Algorithm running when the interface was last drawn, and the layer its boxes are drawn on
+        self.drawn_algorithm = None
+        self.box_layer: Union[BoxLayer, None] = None
+
+        # Comparison with dijkstras last shown for A* or the bidirectional search
+        self.drawn_summary = None
+
+        # Saves and loads graphs without stopping the window
+        self.file_worker = FileWorker(settings)
+
+    def draw(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        """Displays the interface to the screen, returns the areas changed since last drawn"""
+        rects = []
         for button in self.buttons:
-            button.draw(screen)
+            rects += button.draw(screen)
 
         for entry in self.entries:
-            entry.draw(screen)
+            rects += entry.draw(screen)
+
+        # Show how many nodes A* or the bidirectional search has visited compared with dijkstras
+        if type(self.settings.cur_algorithm) in [AStar, BidirectionalDijkstras]:
+            summary = (self.settings.cur_algorithm, self.settings.cur_algorithm.summary())
+            if summary != self.drawn_summary:
+                self.help_label.text = summary[1]
+                self.drawn_summary = summary
+        elif self.drawn_summary is not None:
+            # Clear the comparison once its algorithm has gone, unless replaced by another message
+            if self.help_label.text == self.drawn_summary[1]:
+                self.help_label.text = ""
+            self.drawn_summary = None
 
-        self.help_label.draw(screen)
+        rects += self.help_label.draw(screen)
 
-        if type(self.settings.cur_algorithm) == Dijkstras:
-            for box in self.settings.cur_algorithm.boxes.values():
-                    box.draw(screen)
+        # Update the whole window when an algorithm starts or stops,
+        # as boxes may have appeared or gone
+        if self.settings.cur_algorithm is not self.drawn_algorithm:
+            self.drawn_algorithm = self.settings.cur_algorithm
+            rects.append(screen.get_rect())
+
+            # Create a layer to draw the boxes on
+            self.box_layer = None
+            if isinstance(self.settings.cur_algorithm, Dijkstras):
+                self.box_layer = BoxLayer(self.settings.cur_algorithm)
+
+        # Nodes changed this frame are still waiting to be redrawn on the graph layer
+        if self.box_layer is not None:
+            rects += self.box_layer.draw(screen, self.settings.dirty_elements)
+
+        return rects
 
 
     def run_mouse(
@@ -55,26 +99,41 @@ class Interface:
             button.on_hover(mouse_pos)
             if self.settings.mouse_function is None and button.on_click(mouse_pos, mouse_state):
                 self.settings.mouse_function = "button"
-                if button.label in ["Dijkstras", "Prims"]:
+                if button.label in ["Dijkstras", "A*", "Bidirect", "Prims", "Kruskals"]:
+                    # A new algorithm starts off stopped
+                    self.settings.running = False
+
+                if button.label in ["Dijkstras", "A*", "Bidirect", "Prims"]:
                     self.settings.start_algorithm = button.label
                     self.settings.help_label.text = "Click node to select start node"
                 elif button.label == "Kruskals":
-                    self.settings.cur_algorithm = Kruskals(graph.copy())
+                    self.settings.cur_algorithm = Kruskals(graph.algorithm_copy())
                 elif button.label == "Next":
                     if self.settings.cur_algorithm is not None:
-                        if self.settings.cur_algorithm.next_step() == "Finished":
+                        with profiler.measure("next_step", per_call=True):
+                            result = self.settings.cur_algorithm.next_step()
+                        if result == "Finished":
                             self.settings.cur_algorithm.clear_up()
                             self.settings.cur_algorithm = None
                 elif button.label == "Prev":
                     if self.settings.cur_algorithm is not None:
                         self.settings.cur_algorithm.prev_step()
+                elif button.label == "Run":
+                    if self.settings.cur_algorithm is not None:
+                        self.settings.running = not self.settings.running
+                elif button.label == "Finish":
+                    # Leave the finished algorithm showing until Next is clicked
+                    if self.settings.cur_algorithm is not None:
+                        with profiler.measure("finish", per_call=True):
+                            self.settings.cur_algorithm.finish()
+                        self.settings.running = False
                 elif button.label == "Save Graph":
-                    graph.save_graph(self.entries[0].label)
+                    self.file_worker.save(graph, self.entries[0].label)
                     self.entries[0].label = ""
                     self.entries[0].typing = False
                     self.entries[0].unhighlight()
                 elif button.label == "Load Graph":
-                    graph.load_graph(self.entries[0].label)
+                    self.file_worker.load(graph, self.entries[0].label)
                     self.entries[0].label = ""
                     self.entries[0].typing = False
                     self.entries[0].unhighlight()
@@ -86,6 +145,29 @@ class Interface:
             if self.settings.mouse_function is None and entry.on_click(mouse_pos, mouse_state):
                 self.settings.mouse_function = "entry"
 
+    def run_algorithm(self) -> None:
+        """Steps the running algorithm as many times as fit in the time budget"""
+        if self.settings.cur_algorithm is None:
+            self.settings.running = False
+
+        # Stepping and the comparison count share one time budget each frame
+        end_time = time.perf_counter() + self.settings.run_budget / 1000
+
+        while self.settings.running and time.perf_counter() < end_time:
+            with profiler.measure("next_step", per_call=True):
+                result = self.settings.cur_algorithm.next_step()
+
+            # Stop running at the end, leaving the result showing until Next is clicked
+            if result == "Finished":
+                self.settings.running = False
+
+        # Count the nodes dijkstras visits to compare against with what is left
+        # of the budget, so the window does not stall on large graphs
+        if type(self.settings.cur_algorithm) in [AStar, BidirectionalDijkstras]:
+            comparison = self.settings.cur_algorithm.comparison
+            while comparison.visited is None and time.perf_counter() < end_time:
+                comparison.next_step()
+
     def run_keys(self, pressed_keys: list[bool]) -> None:
         """Runs keyboard functions of the interface"""
         # Run all entry functions
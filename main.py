@@ -7,6 +7,7 @@ from pygame.locals import *
 from graph import Graph
 from settings import Settings
 from interface import Interface
+from profiler import profiler
 
 # Create a window to display elements on
 screen = pygame.display.set_mode((600, 500), RESIZABLE)
@@ -23,10 +24,14 @@ CLICK_WAIT = 12
 wait = 1
 WAIT_AMOUNT = 6
 
+# Whether the whole window needs updating, rather than just changed areas
+full_update = True
+
 # Loop forever
 while 1:
     # Set fps to 60
     clock.tick(60)
+    profiler.start_frame()
     pressed_keys = []
 
     wait -= 1
@@ -64,13 +69,24 @@ while 1:
                     elif start == "show_names":
                         change = str(settings.show_names)+"\n"
                     elif start == "show_weights":
-                        change = settings.show_weight
+                        change = str(settings.show_weight)+"\n"
+                    elif start == "cached_render":
+                        change = str(settings.cached_render)+"\n"
+                    elif start == "run_budget":
+                        change = str(settings.run_budget)+"\n"
                     print(f"{start}:{change}", end="", file=f)
             
             # Exit
             pygame.quit()
             sys.exit()
 
+        # F3 shows the frame timings, F4 saves them to a file
+        if event.type == KEYDOWN and event.key == K_F3:
+            profiler.show = not profiler.show
+        elif event.type == KEYDOWN and event.key == K_F4:
+            profiler.dump("profile.json")
+            settings.help_label.text = "Saved frame timings to profile.json"
+
         if event.type == KEYDOWN and event.key not in [K_BACKSPACE, K_RETURN]:
                 pressed_keys.append(event.unicode)
 
@@ -86,7 +102,16 @@ while 1:
 
         if event.type == VIDEORESIZE:
             screen = pygame.display.set_mode((event.w, event.h), RESIZABLE)
+            full_update = True
     
+    # Swap in any graph finished loading, between frames
+    with profiler.measure("file_worker"):
+        interface.file_worker.update(graph)
+
+    # Step the algorithm if it is running
+    with profiler.measure("run_algorithm"):
+        interface.run_algorithm()
+
     # Clear screen
     screen.fill((255, 255, 255))
 
@@ -94,16 +119,27 @@ while 1:
     mouse_pos = pygame.mouse.get_pos()
     mouse_state = [left_down, right_down]
 
-    # Draw interface and graph
-    interface.draw(screen)
-    graph.draw(mouse_pos, screen)
+    # Draw interface and graph, collecting the areas that changed
+    with profiler.measure("interface_draw"):
+        rects = interface.draw(screen)
+    with profiler.measure("graph_draw"):
+        rects += graph.draw(mouse_pos, screen)
+    rects += profiler.draw(screen)
 
     # Run interface and graph
-    interface.run_mouse(mouse_pos, mouse_state, graph)
-    graph.run_mouse(mouse_pos, mouse_state, pygame.mouse.get_pressed()[0])
-
-    interface.run_keys(pressed_keys)
-    graph.run_keys(pressed_keys)
-
-    # Update the window
-    pygame.display.update()
+    with profiler.measure("interface_mouse"):
+        interface.run_mouse(mouse_pos, mouse_state, graph)
+    with profiler.measure("graph_mouse"):
+        graph.run_mouse(mouse_pos, mouse_state, pygame.mouse.get_pressed()[0])
+
+    with profiler.measure("run_keys"):
+        interface.run_keys(pressed_keys)
+        graph.run_keys(pressed_keys)
+
+    # Update the changed areas of the window
+    with profiler.measure("display_update"):
+        if full_update:
+            pygame.display.update()
+            full_update = False
+        else:
+            pygame.display.update(rects)
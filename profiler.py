@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+# Import base libraries
+import json
+import pygame
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Union
+
+# Import custom scripts
+from fontCache import font_registry, text_cache
+
+# Frame profiler class
+class FrameProfiler:
+    """Times each phase of the main loop, keeping the times of the most recent frames"""
+    def __init__(self, history: int = 600) -> None:
+        """Initialisation function of the frame profiler class"""
+        # Create instance variables
+        self.history = history
+        self.times: dict[str, deque[float]] = {}
+        self.frame_times: dict[str, float] = {}
+        self.frame_start: Union[float, None] = None
+        self.frame_count = 0
+
+        # Overlay showing the times, and what it showed when last drawn
+        self.show = False
+        self.lines: list[str] = []
+        self.drawn_rect: Union[pygame.Rect, None] = None
+
+        # Instance constants
+        self.FONT = font_registry.get("monospace", 12)
+        self.TEXT_COLOUR = (0, 0, 0)
+        self.TEXT_BG = (255, 255, 200)
+        self.REFRESH_FRAMES = 15
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Adds a time to a phase's history"""
+        if phase not in self.times:
+            self.times[phase] = deque(maxlen=self.history)
+        self.times[phase].append(seconds)
+
+    @contextmanager
+    def measure(self, phase: str, per_call: bool = False):
+        """Times the code run inside the with block, adding it to the phase's time
+        for this frame, or recording each call separately if per_call is set"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if per_call:
+                self.record(phase, seconds)
+            else:
+                self.frame_times[phase] = self.frame_times.get(phase, 0) + seconds
+
+    def start_frame(self) -> None:
+        """Records the times of the last frame and starts timing a new one"""
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.record("frame", now - self.frame_start)
+            for (phase, seconds) in self.frame_times.items():
+                self.record(phase, seconds)
+
+        self.frame_times = {}
+        self.frame_start = now
+        self.frame_count += 1
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Returns the count, mean, p50, p95, p99 and max of each phase, in milliseconds"""
+        stats = {}
+        for (phase, times) in self.times.items():
+            ordered = sorted(times)
+            count = len(ordered)
+            stats[phase] = {
+                "count": count,
+                "mean": sum(ordered) / count * 1000,
+                "p50": ordered[min(count - 1, int(count * 0.50))] * 1000,
+                "p95": ordered[min(count - 1, int(count * 0.95))] * 1000,
+                "p99": ordered[min(count - 1, int(count * 0.99))] * 1000,
+                "max": ordered[-1] * 1000
+            }
+
+        return stats
+
+    def dump(self, path: str) -> None:
+        """Writes the stats of each phase to a json file"""
+        with open(path, "w") as f:
+            json.dump({
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "frames": self.frame_count,
+                "history": self.history,
+                "phases": self.stats()
+                }, f, indent=2)
+
+    def draw(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        """Draws the overlay if shown, returns the areas changed"""
+        rects = [self.drawn_rect] if self.drawn_rect is not None else []
+        self.drawn_rect = None
+
+        if not self.show:
+            self.lines = []
+            return rects
+
+        # Only work out the numbers every few frames so they can be read
+        if self.lines == [] or self.frame_count % self.REFRESH_FRAMES == 0:
+            stats = self.stats()
+            fps = 1000 / stats["frame"]["mean"] if "frame" in stats else 0
+            self.lines = [f"FPS {fps:5.1f}   p50    p95    p99 ms"]
+            for (phase, phase_stats) in stats.items():
+                self.lines.append(
+                    f"{phase:<16} {phase_stats['p50']:6.2f} {phase_stats['p95']:6.2f} {phase_stats['p99']:6.2f}")
+
+        # Draw each line below the last
+        x, y = 5, 30
+        for line in self.lines:
+            text = text_cache.render(self.FONT, line, self.TEXT_COLOUR, self.TEXT_BG)
+            rect = screen.blit(text, (x, y))
+            self.drawn_rect = rect if self.drawn_rect is None else self.drawn_rect.union(rect)
+            y += text.get_height()
+
+        if self.drawn_rect is not None:
+            rects.append(self.drawn_rect)
+
+        return rects
+
+# Profiler shared by the main loop and the interface
+profiler = FrameProfiler()
@@ -1,4 +1,5 @@
 from guiElements import Label
+from fontCache import font_registry, text_cache
 
 class Settings:
     def __init__(self, width, height) -> None:
@@ -10,9 +11,32 @@ class Settings:
         self.start_algorithm = None
         self.cur_algorithm = None
         self.mouse_function = None
+
+        # Graph elements that have changed since the graph was last drawn
+        self.dirty_elements: dict = {}
+
         with open("config.txt", "r") as f:
             content = [l.rstrip() for l in f.readlines()]
-        self.font = content[0].split(":")[-1]
+        self._font = content[0].split(":")[-1]
         self.show_names = [True, False][content[1].split(":")[-1].lower() != "true"]
         self.show_weight = [True, False][content[2].split(":")[-1].lower() != "true"]
+
+        # Keep the drawn graph on an off-screen layer unless turned off
+        self.cached_render = len(content) < 4 or content[3].split(":")[-1].lower() == "true"
+
+        # Milliseconds each frame may spend stepping a running algorithm
+        self.run_budget = float(content[4].split(":")[-1]) if len(content) >= 5 else 8.0
+        self.running = False
         self.help_label = Label(5, 5, "", 20, self)
+
+    @property
+    def font(self) -> str:
+        return self._font
+
+    @font.setter
+    def font(self, font: str) -> None:
+        # Fonts and text rendered in the old font are no longer needed
+        if font != self._font:
+            font_registry.clear()
+            text_cache.clear()
+        self._font = font
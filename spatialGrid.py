@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+# Import base libraries
+import math
+from typing import Union
+
+# Spatial grid class
+class SpatialGrid:
+    """Uniform grid used to quickly find items near a point on screen"""
+    def __init__(self, cell_size: int = 50) -> None:
+        """Initialisation function of the spatial grid class"""
+        # Create instance variables
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], dict] = {}
+        self.item_cells: dict[object, list[tuple[int, int]]] = {}
+
+    def cell_of(self, x: Union[int, float], y: Union[int, float]) -> tuple[int, int]:
+        """Returns the cell holding a point"""
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def rect_cells(self, rect: tuple) -> list[tuple[int, int]]:
+        """Returns every cell a rectangle (x, y, width, height) overlaps"""
+        x, y, width, height = rect
+        left, top = self.cell_of(x, y)
+        right, bottom = self.cell_of(x + width, y + height)
+
+        return [(cx, cy) for cx in range(left, right + 1) for cy in range(top, bottom + 1)]
+
+    def segment_cells(self, start: tuple, end: tuple, margin: Union[int, float]) -> list[tuple[int, int]]:
+        """Returns the cells within margin of a line segment"""
+        (x1, y1), (x2, y2) = start, end
+
+        # Work left to right
+        if x1 > x2:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+
+        cells = []
+        first, _ = self.cell_of(x1 - margin, 0)
+        last, _ = self.cell_of(x2 + margin, 0)
+
+        # For each column work out the part of the segment passing through it
+        for cx in range(first, last + 1):
+            low = max(x1, cx * self.cell_size - margin)
+            high = min(x2, (cx + 1) * self.cell_size + margin)
+
+            if x1 == x2:
+                # Vertical segments cover their full height
+                y_low, y_high = min(y1, y2), max(y1, y2)
+            else:
+                gradient = (y2 - y1) / (x2 - x1)
+                y_a = y1 + gradient * (low - x1)
+                y_b = y1 + gradient * (high - x1)
+                y_low, y_high = min(y_a, y_b), max(y_a, y_b)
+
+            _, top = self.cell_of(0, y_low - margin)
+            _, bottom = self.cell_of(0, y_high + margin)
+            cells += [(cx, cy) for cy in range(top, bottom + 1)]
+
+        return cells
+
+    def insert(self, item, cells: list[tuple[int, int]]) -> None:
+        """Adds an item to the given cells, replacing where it was before"""
+        if item in self.item_cells:
+            self.remove(item)
+
+        for cell in cells:
+            self.cells.setdefault(cell, {})[item] = None
+        self.item_cells[item] = cells
+
+    def remove(self, item) -> None:
+        """Removes an item from the grid"""
+        for cell in self.item_cells.pop(item, []):
+            bucket = self.cells[cell]
+            bucket.pop(item, None)
+
+            # Drop empty cells so the grid does not grow forever
+            if bucket == {}:
+                del self.cells[cell]
+
+    def query_point(self, pos: tuple[int, int]) -> list:
+        """Returns the items in the cell holding a point"""
+        return [*self.cells.get(self.cell_of(*pos), {})]
+
+    def query_rect(self, rect: tuple) -> list:
+        """Returns the items in every cell a rectangle overlaps"""
+        found = {}
+        for cell in self.rect_cells(rect):
+            found.update(self.cells.get(cell, {}))
+
+        return [*found]
+
+    def clear(self) -> None:
+        """Removes every item from the grid"""
+        self.cells = {}
+        self.item_cells = {}